@@ -46,6 +46,14 @@ CANVAS_TEMPLATES = {
     }
 }
 
+# Opzioni salvataggio PNG per artifacts intermedi (titoli, composizioni).
+# Vengono solo uploadati: zlib livello 1 senza optimize è 2-5x più veloce
+# a fronte di file ~15% più grandi.
+PNG_SAVE_OPTS = {
+    'compress_level': 1,
+    'optimize': False
+}
+
 # Layout Percentages (basato sulla preview OnlyOne)
 LAYOUT_CONFIG = {
     'front': {
@@ -73,7 +81,10 @@ LAYOUT_CONFIG = {
             'height_percent': 25,     # 20-30% range
             'top_percent': 50,        # Centrato verticalmente
         }
-    }
+    },
+    # Filtro resize finale (nome Image.Resampling). Con pillow-simd installato
+    # al posto di Pillow le convoluzioni di resize usano AVX2.
+    'resample_filter': 'LANCZOS'
 }
 
 # Color Mapping per Contrasto
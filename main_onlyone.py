@@ -1,6 +1,7 @@
 # main_onlyone.py - OnlyOne Workflow Orchestrator Completo
 import os
 import glob
+import logging
 import asyncio
 import time
 from typing import List, Dict, Optional
@@ -13,7 +14,7 @@ from utils.imgur_uploader import ImgurUploader
 from utils.canvas_composer import CanvasComposer
 from utils.font_renderer import batch_generate_titles_for_images
 from utils.advanced_tracker import OnlyOneTracker, batch_create_entries
-from utils.image_utils import validate_onlyone_image, clean_border_artifacts
+from utils.image_utils import validate_onlyone_batch, clean_border_artifacts
 from utils.text_utils import generate_kebab_slug, extract_title_from_slug
 from processors.qa_validator import OnlyOneQAValidator, run_batch_qa_validation
 from config_printful import (
@@ -74,8 +75,9 @@ class OnlyOneCreator:
         valid_images = []
         invalid_images = []
         
-        for image_path in image_files:
-            validation = validate_onlyone_image(image_path)
+        validations = validate_onlyone_batch(image_files)
+        
+        for image_path, validation in zip(image_files, validations):
             
             if validation['valid']:
                 valid_images.append(image_path)
@@ -527,4 +529,6 @@ async def main():
         print(f"\n❌ Errore main: {e}")
 
 if __name__ == "__main__":
+    # Output console dei moduli che usano logging (composer, font renderer)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     asyncio.run(main())
\ No newline at end of file
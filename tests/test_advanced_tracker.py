@@ -0,0 +1,26 @@
+# tests/test_advanced_tracker.py - Regressioni tracking OnlyOne
+from datetime import datetime
+
+from utils.advanced_tracker import OnlyOneTracker
+
+def test_timestamp_precisione_mista_sopravvive_a_load_save_load(tmp_path):
+    """CSV con timestamp con e senza microsecondi: nessuno deve diventare vuoto"""
+    csv_path = tmp_path / "tracking.csv"
+    stamps = {
+        'alpha': '2024-01-02T10:00:00.123456',
+        'beta': '2024-01-01T10:00:00',
+    }
+    
+    # Entrambi gli ordini: il formato non deve dipendere dalla prima riga
+    for order in (['alpha', 'beta'], ['beta', 'alpha']):
+        rows = "\n".join(f"{slug},{stamps[slug]}" for slug in order)
+        csv_path.write_text(f"slug,timestamp\n{rows}\n")
+        
+        tracker = OnlyOneTracker(str(csv_path))
+        assert tracker.df['timestamp'].notna().all()
+        assert tracker.save()
+        
+        reloaded = OnlyOneTracker(str(csv_path))
+        for slug, stamp in stamps.items():
+            entry = reloaded.get_entry(slug)
+            assert datetime.fromisoformat(entry['timestamp']) == datetime.fromisoformat(stamp)
@@ -5,6 +5,9 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import json
 
+# Formato ISO dei timestamp nel CSV (come datetime.isoformat())
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
 class OnlyOneTracker:
     """
     Sistema di tracking avanzato per workflow OnlyOne.
@@ -42,6 +45,11 @@ class OnlyOneTracker:
             print(f"⚠️ Errore caricamento CSV: {e}")
             print("  Creo nuovo DataFrame vuoto")
             self.df = pd.DataFrame(columns=self.schema)
+        
+        # Timestamp come datetime64 per ordinamento e formattazione vettoriale.
+        # ISO8601: i CSV esistenti mescolano valori con e senza .ffffff
+        # (isoformat() omette i microsecondi quando sono 0)
+        self.df['timestamp'] = pd.to_datetime(self.df['timestamp'], format='ISO8601', errors='coerce')
     
     def create_entry(self, slug: str, title: Optional[str] = None) -> bool:
         """
@@ -66,7 +74,7 @@ class OnlyOneTracker:
                 'slug': slug,
                 'title': title or slug.replace('-', ' ').title(),
                 'status': 'draft',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now()
             })
             
             # Aggiungi al DataFrame
@@ -189,7 +197,7 @@ class OnlyOneTracker:
                 'colors_dark': product_data.get('colors_dark', 'Black,Charcoal,Navy'),
                 'sizes': product_data.get('sizes', 'S,M,L,XL,XXL'),
                 'status': 'published',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now()
             }
             
             updated_fields = []
@@ -220,7 +228,7 @@ class OnlyOneTracker:
             if self.df.empty or slug not in self.df['slug'].values:
                 return None
             
-            row = self.df[self.df['slug'] == slug].iloc[0]
+            row = self._with_iso_timestamps(self.df[self.df['slug'] == slug]).iloc[0]
             return row.to_dict()
             
         except Exception as e:
@@ -242,12 +250,17 @@ class OnlyOneTracker:
                 return []
             
             filtered_df = self.df[self.df['status'] == status]
-            return filtered_df.to_dict('records')
+            return self._with_iso_timestamps(filtered_df).to_dict('records')
             
         except Exception as e:
             print(f"❌ Errore filtro per status {status}: {e}")
             return []
     
+    def _with_iso_timestamps(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Copia di df con timestamp come stringhe ISO (formato del CSV), None se mancanti"""
+        iso = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce').dt.strftime(TIMESTAMP_FORMAT)
+        return df.assign(timestamp=iso.astype(object).where(iso.notna(), None))
+    
     def save(self) -> bool:
         """
         Salva il DataFrame nel file CSV.
@@ -260,7 +273,8 @@ class OnlyOneTracker:
             os.makedirs(os.path.dirname(self.csv_path), exist_ok=True)
             
             # Salva con encoding UTF-8 per caratteri speciali
-            self.df.to_csv(self.csv_path, index=False, encoding='utf-8')
+            # Timestamp in ISO, stesso formato scritto prima del parsing a datetime64
+            self.df.to_csv(self.csv_path, index=False, encoding='utf-8', date_format=TIMESTAMP_FORMAT)
             
             print(f"💾 Tracking salvato: {len(self.df)} entries in {os.path.basename(self.csv_path)}")
             return True
@@ -299,7 +313,10 @@ class OnlyOneTracker:
             
             # Attività recente (ultimi 5)
             if 'timestamp' in self.df.columns:
-                recent = self.df.nlargest(5, 'timestamp')[['slug', 'status', 'timestamp']]
+                recent = self.df.nlargest(5, 'timestamp')[['slug', 'status', 'timestamp']].assign(
+                    # Solo data; timestamp mancanti/non validi (NaT) come stringa vuota
+                    timestamp=lambda d: d['timestamp'].dt.strftime('%Y-%m-%d').fillna('')
+                )
                 summary['recent_activity'] = recent.to_dict('records')
             
             return summary
@@ -336,8 +353,7 @@ class OnlyOneTracker:
         if 'recent_activity' in summary and summary['recent_activity']:
             print(f"\n🕒 Attività recente:")
             for activity in summary['recent_activity'][:3]:
-                timestamp = activity.get('timestamp', '')[:10]  # Solo data
-                print(f"  • {activity.get('slug', 'N/A')} → {activity.get('status', 'N/A')} ({timestamp})")
+                print(f"  • {activity.get('slug', 'N/A')} → {activity.get('status', 'N/A')} ({activity.get('timestamp', '')})")
 
 def batch_create_entries(image_files: List[str], tracker: Optional[OnlyOneTracker] = None) -> OnlyOneTracker:
     """
@@ -1,9 +1,70 @@
 # utils/canvas_composer.py - Canvas Composer per OnlyOne workflow
 from PIL import Image, ImageDraw
+import numpy as np
 import os
-from typing import Dict, Tuple, Optional, List
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Optional, List, Union
 import math
 
+logger = logging.getLogger(__name__)
+
+def _premultiply(layer: Image.Image) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte un layer RGBA in piani SoA premoltiplicati per la composizione.
+    Tutti i canali (alpha incluso) sono moltiplicati per alpha: la composizione
+    riproduce esattamente canvas.paste(layer, (x, y), layer).
+    
+    Args:
+        layer: Immagine RGBA ridimensionata
+        
+    Returns:
+        (piani uint16 (4, h, w) canale * alpha, inv_alpha uint16 (h, w) 255 - alpha)
+    """
+    pixels = np.asarray(layer)
+    alpha = pixels[..., 3].astype(np.uint16)
+    
+    planes = np.moveaxis(pixels, -1, 0).astype(np.uint16)
+    planes *= alpha
+    return planes, 255 - alpha
+
+def _over_premult(canvas: np.ndarray, layer: Tuple[np.ndarray, np.ndarray], x: int, y: int):
+    """
+    Compone in-place un layer premoltiplicato sul canvas planare.
+    out = (src_premult + dst * (255 - a)) / 255, senza branch per pixel.
+    
+    Args:
+        canvas: Piani uint8 (4, H, W) del canvas
+        layer: Output di _premultiply
+        x, y: Posizione top-left sul canvas
+    """
+    planes, inv_alpha = layer
+    canvas_h, canvas_w = canvas.shape[1:]
+    layer_h, layer_w = inv_alpha.shape
+    
+    # Ritaglia il layer alla porzione visibile sul canvas
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + layer_w, canvas_w), min(y + layer_h, canvas_h)
+    if x0 >= x1 or y0 >= y1:
+        return
+    
+    src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+    inv = inv_alpha[src]
+    blend = np.empty(inv.shape, dtype=np.uint16)
+    
+    # Un piano alla volta: temporanei contigui di un solo canale
+    for dst_plane, src_plane in zip(canvas[:, y0:y1, x0:x1], planes):
+        np.multiply(dst_plane, inv, out=blend)
+        blend += src_plane[src]
+        blend += 127
+        blend //= 255
+        dst_plane[...] = blend
+
+def _planes_to_image(canvas: np.ndarray) -> Image.Image:
+    """Ricompone i piani (4, H, W) del canvas in un'immagine RGBA."""
+    return Image.merge('RGBA', [Image.fromarray(plane) for plane in canvas])
+
 class CanvasComposer:
     """
     Composer per creare layout OnlyOne con front/back/sleeve.
@@ -11,9 +72,15 @@ class CanvasComposer:
     """
     
     def __init__(self):
-        from config_printful import CANVAS_TEMPLATES, LAYOUT_CONFIG
+        from config_printful import CANVAS_TEMPLATES, LAYOUT_CONFIG, PNG_SAVE_OPTS
         self.canvas_templates = CANVAS_TEMPLATES
         self.layout_config = LAYOUT_CONFIG
+        self.png_save_opts = PNG_SAVE_OPTS
+        
+        # Pool di canvas NumPy riusabili per dimensione (evita ~70MB di allocazioni fresche per composizione)
+        self._canvas_pool: Dict[Tuple[int, int], List[np.ndarray]] = {}
+        self._canvas_pool_lock = threading.Lock()
+        self._canvas_pool_limit = 2
         
     def calculate_position(self, canvas_size: Tuple[int, int], element_size: Tuple[int, int], 
                           position_config: Dict, alignment: str = 'center') -> Tuple[int, int]:
@@ -50,38 +117,203 @@ class CanvasComposer:
             
         return x, y
     
-    def resize_maintaining_aspect(self, image: Image.Image, target_config: Dict, 
-                                 canvas_size: Tuple[int, int]) -> Image.Image:
+    def calculate_positions_batch(self, element_sizes: List[Tuple[int, int]],
+                                  position_configs: List[Dict],
+                                  canvas_sizes: List[Tuple[int, int]],
+                                  margins: List[int]) -> List[Tuple[int, int]]:
         """
-        Ridimensiona immagine mantenendo aspect ratio secondo configurazione.
+        Calcola in un'unica passata NumPy le posizioni centrate di N elementi,
+        con margini di sicurezza già applicati.
+        Equivalente vettoriale di calculate_position + apply_safe_margins.
         
         Args:
-            image: PIL Image da ridimensionare
+            element_sizes: Lista (width, height) degli elementi ridimensionati
+            position_configs: Config layout per ogni elemento (top_percent opzionale)
+            canvas_sizes: Lista (width, height) del canvas di ogni elemento
+            margins: Safe margin in pixel per ogni elemento
+            
+        Returns:
+            Lista (x, y) posizioni top-left per elemento
+        """
+        if not element_sizes:
+            return []
+        
+        elem_w, elem_h = np.array(element_sizes, dtype=np.int64).T
+        canvas_w, canvas_h = np.array(canvas_sizes, dtype=np.int64).T
+        margin = np.array(margins, dtype=np.int64)
+        top_percent = np.array([cfg.get('top_percent', np.nan) for cfg in position_configs], dtype=np.float64)
+        
+        # Posizione verticale da percentuale, altrimenti centrata
+        has_top = ~np.isnan(top_percent)
+        y = np.where(has_top, (canvas_h * np.nan_to_num(top_percent) / 100).astype(np.int64),
+                     (canvas_h - elem_h) // 2)
+        x = (canvas_w - elem_w) // 2
+        
+        # Safe area: max(margin, min(pos, canvas - elem - margin))
+        x = np.maximum(margin, np.minimum(x, canvas_w - elem_w - margin))
+        y = np.maximum(margin, np.minimum(y, canvas_h - elem_h - margin))
+        
+        return [(int(px), int(py)) for px, py in zip(x, y)]
+    
+    def element_target_size(self, source: Union[str, Image.Image, None], target_config: Dict,
+                            canvas_size: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Dimensioni finali di un elemento sul canvas leggendo solo l'header del file.
+        
+        Returns:
+            (width, height) dopo resize o None se l'elemento non esiste
+        """
+        if isinstance(source, Image.Image):
+            size = source.size
+        elif source and os.path.exists(source):
+            with Image.open(source) as img:
+                size = img.size
+        else:
+            return None
+        
+        target_size = self.calculate_target_size(size, target_config, canvas_size)
+        if target_size is None or not self._needs_resize(size, target_size):
+            return size
+        return target_size
+    
+    def plan_product_layout(self, main_image: Union[str, Image.Image],
+                            asset_urls: Dict[str, str]) -> Dict[str, Dict[str, Tuple[int, int]]]:
+        """
+        Tabella posizioni di tutti gli elementi per tutte le composizioni di un prodotto,
+        calcolata una volta con calculate_positions_batch.
+        
+        Args:
+            main_image: Path o Image del design principale
+            asset_urls: Dict con path degli asset (title_dark, wordmark_dark, logo_dark, etc.)
+            
+        Returns:
+            Dict {composizione: {elemento: ((x, y), (width, height))}}
+        """
+        front = self.layout_config['front']
+        # (composizione, elemento, sorgente, config, tipo canvas)
+        elements = [
+            ('front_light', 'main_image', main_image, front['main_image'], 'main'),
+            ('front_light', 'title', asset_urls.get('title_dark'), front['title'], 'main'),
+            ('front_light', 'wordmark', asset_urls.get('wordmark_dark'), front['wordmark'], 'main'),
+            ('front_dark', 'main_image', main_image, front['main_image'], 'main'),
+            ('front_dark', 'title', asset_urls.get('title_light'), front['title'], 'main'),
+            ('front_dark', 'wordmark', asset_urls.get('wordmark_light'), front['wordmark'], 'main'),
+            ('back', 'main_image', main_image, self.layout_config['back']['main_image'], 'main'),
+            ('sleeve_dark', 'logo', asset_urls.get('logo_dark'), self.layout_config['sleeve']['logo'], 'sleeve'),
+            ('sleeve_light', 'logo', asset_urls.get('logo_light'), self.layout_config['sleeve']['logo'], 'sleeve'),
+        ]
+        
+        keys, sizes, configs, canvas_sizes, margins = [], [], [], [], []
+        element_sizes = {}
+        for composition, element, source, config, canvas_type in elements:
+            template = self.canvas_templates[canvas_type]
+            canvas_size = (template['width'], template['height'])
+            
+            # Il design principale con la stessa config compare più volte: header letto una volta
+            cache_key = (id(source), id(config), canvas_type)
+            if cache_key not in element_sizes:
+                element_sizes[cache_key] = self.element_target_size(source, config, canvas_size)
+            size = element_sizes[cache_key]
+            if size is None:
+                continue
+            
+            keys.append((composition, element))
+            sizes.append(size)
+            configs.append(config)
+            canvas_sizes.append(canvas_size)
+            margins.append(template['safe_margin'])
+        
+        layout = {}
+        positions = self.calculate_positions_batch(sizes, configs, canvas_sizes, margins)
+        for (composition, element), pos, size in zip(keys, positions, sizes):
+            layout.setdefault(composition, {})[element] = (pos, size)
+        return layout
+    
+    def _resolve_position(self, positions: Optional[Dict[str, Tuple]], element: str,
+                          element_size: Tuple[int, int], position_config: Dict,
+                          canvas_size: Tuple[int, int], margin: int) -> Tuple[int, int]:
+        """Posizione precalcolata se valida per la size effettiva, altrimenti calcolo scalare."""
+        planned = positions.get(element) if positions else None
+        if planned is not None and planned[1] == element_size:
+            return planned[0]
+        pos = self.calculate_position(canvas_size, element_size, position_config)
+        return self.apply_safe_margins(pos, element_size, canvas_size, margin)
+    
+    def calculate_target_size(self, element_size: Tuple[int, int], target_config: Dict,
+                              canvas_size: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """
+        Calcola dimensioni target mantenendo aspect ratio secondo configurazione.
+        
+        Args:
+            element_size: (width, height) dell'elemento
             target_config: Config con width_percent o height_percent
             canvas_size: Dimensioni canvas di riferimento
             
         Returns:
-            Immagine ridimensionata
+            (width, height) target o None se la config non specifica dimensioni
         """
         canvas_w, canvas_h = canvas_size
+        elem_w, elem_h = element_size
         
         # Calcola dimensioni target da percentuale
         if 'width_percent' in target_config:
             target_width = int(canvas_w * target_config['width_percent'] / 100)
             # Calcola altezza mantenendo aspect ratio
-            aspect_ratio = image.height / image.width
+            aspect_ratio = elem_h / elem_w
             target_height = int(target_width * aspect_ratio)
         elif 'height_percent' in target_config:
             target_height = int(canvas_h * target_config['height_percent'] / 100)
             # Calcola larghezza mantenendo aspect ratio
-            aspect_ratio = image.width / image.height
+            aspect_ratio = elem_w / elem_h
             target_width = int(target_height * aspect_ratio)
         else:
+            return None
+        
+        return target_width, target_height
+    
+    @staticmethod
+    def _needs_resize(size: Tuple[int, int], target_size: Tuple[int, int], tolerance: int = 1) -> bool:
+        """True se size differisce dal target di più di tolerance pixel su almeno un lato."""
+        return abs(size[0] - target_size[0]) > tolerance or abs(size[1] - target_size[1]) > tolerance
+    
+    def resize_maintaining_aspect(self, image: Image.Image, target_config: Dict, 
+                                 canvas_size: Tuple[int, int]) -> Image.Image:
+        """
+        Ridimensiona immagine mantenendo aspect ratio secondo configurazione.
+        
+        Per sorgenti JPEG passare l'oggetto restituito da Image.open() non ancora
+        decodificato: draft() può così decodificare direttamente in scala ridotta.
+        
+        Args:
+            image: PIL Image da ridimensionare
+            target_config: Config con width_percent o height_percent
+            canvas_size: Dimensioni canvas di riferimento
+            
+        Returns:
+            Immagine ridimensionata
+        """
+        target_size = self.calculate_target_size(image.size, target_config, canvas_size)
+        if target_size is None:
             # Nessuna configurazione, mantieni dimensioni originali
             return image
+        target_width, target_height = target_size
+        
+        # JPEG: decodifica DCT a 1/2, 1/4, 1/8 restando >= 2x target (no-op se già caricata)
+        if image.format == 'JPEG':
+            image.draft('RGB', (target_width * 2, target_height * 2))
+            target_width, target_height = self.calculate_target_size(image.size, target_config, canvas_size)
+        
+        # Già alle dimensioni target (±1px di arrotondamento): niente convoluzione
+        if not self._needs_resize(image.size, (target_width, target_height)):
+            return image
+        
+        # Ridimensiona con alta qualità: per downscale forti pre-riduzione box
+        # fino a 2x target, poi filtro finale (LANCZOS) su molti meno pixel
+        if image.width > target_width * 2 and image.height > target_height * 2:
+            image = image.resize((target_width * 2, target_height * 2), Image.Resampling.BOX)
         
-        # Ridimensiona con alta qualità
-        return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        resample = Image.Resampling[self.layout_config.get('resample_filter', 'LANCZOS')]
+        return image.resize((target_width, target_height), resample)
     
     def apply_safe_margins(self, position: Tuple[int, int], element_size: Tuple[int, int], 
                           canvas_size: Tuple[int, int], margin: int = 75) -> Tuple[int, int]:
@@ -107,203 +339,283 @@ class CanvasComposer:
         
         return x, y
     
-    def compose_front(self, main_image_path: str, title_image_path: str, 
-                     wordmark_image_path: str, output_path: str) -> bool:
+    def _acquire_canvas(self, canvas_size: Tuple[int, int]) -> np.ndarray:
+        """
+        Restituisce un canvas planare (4, H, W) trasparente, riusando un buffer del pool se disponibile.
+        
+        Args:
+            canvas_size: (width, height) del canvas
+            
+        Returns:
+            Piani uint8 con RGB bianco e alpha 0
+        """
+        with self._canvas_pool_lock:
+            pool = self._canvas_pool.get(canvas_size)
+            canvas = pool.pop() if pool else None
+        
+        if canvas is None:
+            canvas = np.empty((4, canvas_size[1], canvas_size[0]), dtype=np.uint8)
+        
+        # Reset al bianco trasparente di Image.new('RGBA', size, (255, 255, 255, 0))
+        canvas[:3] = 255
+        canvas[3] = 0
+        return canvas
+    
+    def _release_canvas(self, canvas: Optional[np.ndarray]):
+        """Rimette un canvas nel pool (oltre il limite per dimensione viene liberato)."""
+        if canvas is None:
+            return
+        canvas_size = (canvas.shape[2], canvas.shape[1])
+        with self._canvas_pool_lock:
+            pool = self._canvas_pool.setdefault(canvas_size, [])
+            if len(pool) < self._canvas_pool_limit:
+                pool.append(canvas)
+    
+    def load_element(self, source: Union[str, Image.Image, None],
+                     target_config: Optional[Dict] = None,
+                     canvas_size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+        """
+        Carica un elemento grafico come Image RGBA.
+        
+        Args:
+            source: Path immagine oppure Image già decodificata (riusata as-is)
+            target_config: Config layout dell'elemento (abilita draft() per JPEG)
+            canvas_size: Dimensioni canvas di riferimento per target_config
+            
+        Returns:
+            Image RGBA o None se il file non esiste
+        """
+        if isinstance(source, Image.Image):
+            return source
+        if source and os.path.exists(source):
+            img = Image.open(source)
+            
+            # JPEG molto più grandi del target: decodifica in scala ridotta
+            if img.format == 'JPEG' and target_config and canvas_size:
+                target_size = self.calculate_target_size(img.size, target_config, canvas_size)
+                if target_size:
+                    img.draft('RGB', (target_size[0] * 2, target_size[1] * 2))
+            
+            # PNG già RGBA: decodifica in place, senza la copia di convert()
+            if img.mode == 'RGBA':
+                img.load()
+                return img
+            return img.convert('RGBA')
+        return None
+    
+    def compose_front(self, main_image_path: Union[str, Image.Image], title_image_path: str, 
+                     wordmark_image_path: str, output_path: str,
+                     positions: Optional[Dict[str, Tuple]] = None) -> bool:
         """
         Compone layout FRONT: Design → Titolo Curvato → Wordmark.
         
         Args:
-            main_image_path: Path design principale
+            main_image_path: Path design principale o Image RGBA già decodificata
             title_image_path: Path titolo curvato (già generato)
             wordmark_image_path: Path wordmark "The Only One"
             output_path: Path output PNG composito
+            positions: Posizioni precalcolate da plan_product_layout (opzionale)
             
         Returns:
             True se successo
         """
+        canvas = None
         try:
             # Canvas principale 12x16" @300DPI
             template = self.canvas_templates['main']
             canvas_size = (template['width'], template['height'])
             safe_margin = template['safe_margin']
             
-            # Crea canvas trasparente
-            canvas = Image.new('RGBA', canvas_size, (255, 255, 255, 0))
+            # Canvas trasparente (piani R, G, B, A NumPy) dal pool
+            canvas = self._acquire_canvas(canvas_size)
             
-            print(f"🎨 Composizione FRONT su canvas {canvas_size[0]}x{canvas_size[1]}px")
+            logger.info("🎨 Composizione FRONT su canvas %sx%spx", canvas_size[0], canvas_size[1])
             
             # 1. DESIGN PRINCIPALE
-            if os.path.exists(main_image_path):
-                main_img = Image.open(main_image_path).convert('RGBA')
-                main_config = self.layout_config['front']['main_image']
+            main_config = self.layout_config['front']['main_image']
+            main_img = self.load_element(main_image_path, main_config, canvas_size)
+            if main_img is not None:
                 
                 # Ridimensiona secondo configurazione
                 main_resized = self.resize_maintaining_aspect(main_img, main_config, canvas_size)
                 
                 # Calcola posizione
-                main_pos = self.calculate_position(canvas_size, main_resized.size, main_config)
-                main_pos = self.apply_safe_margins(main_pos, main_resized.size, canvas_size, safe_margin)
+                main_pos = self._resolve_position(positions, 'main_image', main_resized.size, main_config,
+                                                  canvas_size, safe_margin)
                 
                 # Componi su canvas
-                canvas.paste(main_resized, main_pos, main_resized)
-                print(f"  ✅ Design principale: {main_resized.size} @ {main_pos}")
+                _over_premult(canvas, _premultiply(main_resized), *main_pos)
+                logger.info("  ✅ Design principale: %s @ %s", main_resized.size, main_pos)
             else:
-                print(f"  ⚠️ Design principale non trovato: {main_image_path}")
+                logger.warning("  ⚠️ Design principale non trovato: %s", main_image_path)
             
             # 2. TITOLO CURVATO
-            if os.path.exists(title_image_path):
-                title_img = Image.open(title_image_path).convert('RGBA')
-                title_config = self.layout_config['front']['title']
+            title_config = self.layout_config['front']['title']
+            title_img = self.load_element(title_image_path, title_config, canvas_size)
+            if title_img is not None:
                 
                 # Ridimensiona se necessario
                 title_resized = self.resize_maintaining_aspect(title_img, title_config, canvas_size)
                 
                 # Calcola posizione
-                title_pos = self.calculate_position(canvas_size, title_resized.size, title_config)
-                title_pos = self.apply_safe_margins(title_pos, title_resized.size, canvas_size, safe_margin)
+                title_pos = self._resolve_position(positions, 'title', title_resized.size, title_config,
+                                                   canvas_size, safe_margin)
                 
                 # Componi su canvas
-                canvas.paste(title_resized, title_pos, title_resized)
-                print(f"  ✅ Titolo curvato: {title_resized.size} @ {title_pos}")
+                _over_premult(canvas, _premultiply(title_resized), *title_pos)
+                logger.info("  ✅ Titolo curvato: %s @ %s", title_resized.size, title_pos)
             else:
-                print(f"  ⚠️ Titolo non trovato: {title_image_path}")
+                logger.warning("  ⚠️ Titolo non trovato: %s", title_image_path)
             
             # 3. WORDMARK "THE ONLY ONE"
-            if os.path.exists(wordmark_image_path):
-                wordmark_img = Image.open(wordmark_image_path).convert('RGBA')
-                wordmark_config = self.layout_config['front']['wordmark']
+            wordmark_config = self.layout_config['front']['wordmark']
+            wordmark_img = self.load_element(wordmark_image_path, wordmark_config, canvas_size)
+            if wordmark_img is not None:
                 
                 # Ridimensiona
                 wordmark_resized = self.resize_maintaining_aspect(wordmark_img, wordmark_config, canvas_size)
                 
                 # Calcola posizione
-                wordmark_pos = self.calculate_position(canvas_size, wordmark_resized.size, wordmark_config)
-                wordmark_pos = self.apply_safe_margins(wordmark_pos, wordmark_resized.size, canvas_size, safe_margin)
+                wordmark_pos = self._resolve_position(positions, 'wordmark', wordmark_resized.size, wordmark_config,
+                                                      canvas_size, safe_margin)
                 
                 # Componi su canvas
-                canvas.paste(wordmark_resized, wordmark_pos, wordmark_resized)
-                print(f"  ✅ Wordmark: {wordmark_resized.size} @ {wordmark_pos}")
+                _over_premult(canvas, _premultiply(wordmark_resized), *wordmark_pos)
+                logger.info("  ✅ Wordmark: %s @ %s", wordmark_resized.size, wordmark_pos)
             else:
-                print(f"  ⚠️ Wordmark non trovato: {wordmark_image_path}")
+                logger.warning("  ⚠️ Wordmark non trovato: %s", wordmark_image_path)
             
             # Salva composizione
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            canvas.save(output_path, 'PNG', optimize=True)
-            print(f"  💾 Front salvato: {os.path.basename(output_path)}")
+            _planes_to_image(canvas).save(output_path, 'PNG', **self.png_save_opts)
+            logger.info("  💾 Front salvato: %s", os.path.basename(output_path))
             
             return True
             
         except Exception as e:
-            print(f"❌ Errore composizione front: {e}")
+            logger.error("❌ Errore composizione front: %s", e)
             return False
+        finally:
+            self._release_canvas(canvas)
     
-    def compose_back(self, main_image_path: str, output_path: str) -> bool:
+    def compose_back(self, main_image_path: Union[str, Image.Image], output_path: str,
+                     positions: Optional[Dict[str, Tuple]] = None) -> bool:
         """
         Compone layout BACK: Solo design principale grande centrato.
         
         Args:
-            main_image_path: Path design principale
+            main_image_path: Path design principale o Image RGBA già decodificata
             output_path: Path output PNG
+            positions: Posizioni precalcolate da plan_product_layout (opzionale)
             
         Returns:
             True se successo
         """
+        canvas = None
         try:
             # Canvas principale
             template = self.canvas_templates['main']
             canvas_size = (template['width'], template['height'])
             safe_margin = template['safe_margin']
             
-            # Crea canvas trasparente
-            canvas = Image.new('RGBA', canvas_size, (255, 255, 255, 0))
+            # Canvas trasparente (piani R, G, B, A NumPy) dal pool
+            canvas = self._acquire_canvas(canvas_size)
             
-            print(f"🎨 Composizione BACK su canvas {canvas_size[0]}x{canvas_size[1]}px")
+            logger.info("🎨 Composizione BACK su canvas %sx%spx", canvas_size[0], canvas_size[1])
             
             # DESIGN PRINCIPALE (più grande per il back)
-            if os.path.exists(main_image_path):
-                main_img = Image.open(main_image_path).convert('RGBA')
-                back_config = self.layout_config['back']['main_image']
+            back_config = self.layout_config['back']['main_image']
+            main_img = self.load_element(main_image_path, back_config, canvas_size)
+            if main_img is not None:
                 
                 # Ridimensiona (più grande rispetto al front)
                 main_resized = self.resize_maintaining_aspect(main_img, back_config, canvas_size)
                 
                 # Posizione centrata verticalmente
-                main_pos = self.calculate_position(canvas_size, main_resized.size, back_config)
-                main_pos = self.apply_safe_margins(main_pos, main_resized.size, canvas_size, safe_margin)
+                main_pos = self._resolve_position(positions, 'main_image', main_resized.size, back_config,
+                                                  canvas_size, safe_margin)
                 
                 # Componi su canvas
-                canvas.paste(main_resized, main_pos, main_resized)
-                print(f"  ✅ Design back: {main_resized.size} @ {main_pos}")
+                _over_premult(canvas, _premultiply(main_resized), *main_pos)
+                logger.info("  ✅ Design back: %s @ %s", main_resized.size, main_pos)
             else:
-                print(f"  ⚠️ Design principale non trovato: {main_image_path}")
+                logger.warning("  ⚠️ Design principale non trovato: %s", main_image_path)
                 return False
             
             # Salva composizione
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            canvas.save(output_path, 'PNG', optimize=True)
-            print(f"  💾 Back salvato: {os.path.basename(output_path)}")
+            _planes_to_image(canvas).save(output_path, 'PNG', **self.png_save_opts)
+            logger.info("  💾 Back salvato: %s", os.path.basename(output_path))
             
             return True
             
         except Exception as e:
-            print(f"❌ Errore composizione back: {e}")
+            logger.error("❌ Errore composizione back: %s", e)
             return False
+        finally:
+            self._release_canvas(canvas)
     
-    def compose_sleeve(self, logo_image_path: str, output_path: str) -> bool:
+    def compose_sleeve(self, logo_image_path: str, output_path: str,
+                       positions: Optional[Dict[str, Tuple]] = None) -> bool:
         """
         Compone layout SLEEVE: Solo logo OnlyOne centrato.
         
         Args:
             logo_image_path: Path logo OnlyOne
             output_path: Path output PNG
+            positions: Posizioni precalcolate da plan_product_layout (opzionale)
             
         Returns:
             True se successo
         """
+        canvas = None
         try:
             # Canvas manica 3x14" @300DPI
             template = self.canvas_templates['sleeve']
             canvas_size = (template['width'], template['height'])
             safe_margin = template['safe_margin']
             
-            # Crea canvas trasparente
-            canvas = Image.new('RGBA', canvas_size, (255, 255, 255, 0))
+            # Canvas trasparente (piani R, G, B, A NumPy) dal pool
+            canvas = self._acquire_canvas(canvas_size)
             
-            print(f"🎨 Composizione SLEEVE su canvas {canvas_size[0]}x{canvas_size[1]}px")
+            logger.info("🎨 Composizione SLEEVE su canvas %sx%spx", canvas_size[0], canvas_size[1])
             
             # LOGO ONLYONE
-            if os.path.exists(logo_image_path):
-                logo_img = Image.open(logo_image_path).convert('RGBA')
-                sleeve_config = self.layout_config['sleeve']['logo']
+            sleeve_config = self.layout_config['sleeve']['logo']
+            logo_img = self.load_element(logo_image_path, sleeve_config, canvas_size)
+            if logo_img is not None:
                 
                 # Ridimensiona
                 logo_resized = self.resize_maintaining_aspect(logo_img, sleeve_config, canvas_size)
                 
                 # Posizione centrata
-                logo_pos = self.calculate_position(canvas_size, logo_resized.size, sleeve_config)
-                logo_pos = self.apply_safe_margins(logo_pos, logo_resized.size, canvas_size, safe_margin)
+                logo_pos = self._resolve_position(positions, 'logo', logo_resized.size, sleeve_config,
+                                                  canvas_size, safe_margin)
                 
                 # Componi su canvas
-                canvas.paste(logo_resized, logo_pos, logo_resized)
-                print(f"  ✅ Logo sleeve: {logo_resized.size} @ {logo_pos}")
+                _over_premult(canvas, _premultiply(logo_resized), *logo_pos)
+                logger.info("  ✅ Logo sleeve: %s @ %s", logo_resized.size, logo_pos)
             else:
-                print(f"  ⚠️ Logo non trovato: {logo_image_path}")
+                logger.warning("  ⚠️ Logo non trovato: %s", logo_image_path)
                 return False
             
             # Salva composizione
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            canvas.save(output_path, 'PNG', optimize=True)
-            print(f"  💾 Sleeve salvato: {os.path.basename(output_path)}")
+            _planes_to_image(canvas).save(output_path, 'PNG', **self.png_save_opts)
+            logger.info("  💾 Sleeve salvato: %s", os.path.basename(output_path))
             
             return True
             
         except Exception as e:
-            print(f"❌ Errore composizione sleeve: {e}")
+            logger.error("❌ Errore composizione sleeve: %s", e)
             return False
+        finally:
+            self._release_canvas(canvas)
     
     def create_all_variants_for_product(self, slug: str, main_image_path: str, 
                                        asset_urls: Dict[str, str], 
-                                       output_dir: str = "artifacts") -> Dict[str, str]:
+                                       output_dir: str = "artifacts",
+                                       max_workers: int = 5) -> Dict[str, str]:
         """
         Crea tutte le varianti di composizione per un prodotto.
         
@@ -312,6 +624,7 @@ class CanvasComposer:
             main_image_path: Path immagine principale
             asset_urls: Dict con path degli asset (title_dark, title_light, wordmark_dark, etc.)
             output_dir: Directory output
+            max_workers: Numero massimo di composizioni in parallelo
             
         Returns:
             Dict con path dei file generati
@@ -328,62 +641,71 @@ class CanvasComposer:
         product_dir = os.path.join(output_dir, slug)
         os.makedirs(product_dir, exist_ok=True)
         
-        print(f"\n🎨 COMPOSIZIONE COMPLETA: {slug}")
-        print("="*50)
+        logger.info("\n🎨 COMPOSIZIONE COMPLETA: %s", slug)
+        logger.info("="*50)
         
         try:
+            # Decodifica il design una sola volta: condiviso da front light/dark e back
+            # (draft JPEG dimensionato sul back, l'elemento più grande)
+            main_template = self.canvas_templates['main']
+            main_image = self.load_element(main_image_path, self.layout_config['back']['main_image'],
+                                           (main_template['width'], main_template['height']))
+            if main_image is None:
+                main_image = main_image_path  # I compose_* segnalano il file mancante
+            
+            # Tabella posizioni calcolata una volta per tutte le composizioni
+            layout = self.plan_product_layout(main_image, asset_urls)
+            
+            # Prepara le composizioni: (chiave risultato, funzione, argomenti, path output)
+            tasks = []
+            
             # 1. FRONT LIGHT (per capi chiari - elementi scuri)
             if asset_urls.get('title_dark') and asset_urls.get('wordmark_dark'):
                 front_light_path = os.path.join(product_dir, f"{slug}_front_light.png")
-                success = self.compose_front(
-                    main_image_path,
-                    asset_urls['title_dark'],
-                    asset_urls['wordmark_dark'],
-                    front_light_path
-                )
-                if success:
-                    results['front_light'] = front_light_path
+                tasks.append(('front_light', self.compose_front,
+                              (main_image, asset_urls['title_dark'], asset_urls['wordmark_dark'], front_light_path,
+                               layout.get('front_light')),
+                              front_light_path))
             
             # 2. FRONT DARK (per capi scuri - elementi chiari)
             if asset_urls.get('title_light') and asset_urls.get('wordmark_light'):
                 front_dark_path = os.path.join(product_dir, f"{slug}_front_dark.png")
-                success = self.compose_front(
-                    main_image_path,
-                    asset_urls['title_light'],
-                    asset_urls['wordmark_light'],
-                    front_dark_path
-                )
-                if success:
-                    results['front_dark'] = front_dark_path
+                tasks.append(('front_dark', self.compose_front,
+                              (main_image, asset_urls['title_light'], asset_urls['wordmark_light'], front_dark_path,
+                               layout.get('front_dark')),
+                              front_dark_path))
             
             # 3. BACK (universale)
             back_path = os.path.join(product_dir, f"{slug}_back.png")
-            success = self.compose_back(main_image_path, back_path)
-            if success:
-                results['back'] = back_path
+            tasks.append(('back', self.compose_back, (main_image, back_path, layout.get('back')), back_path))
             
             # 4. SLEEVE DARK (per capi chiari - logo scuro)
             if asset_urls.get('logo_dark'):
                 sleeve_dark_path = os.path.join(product_dir, f"{slug}_sleeve_dark.png")
-                success = self.compose_sleeve(asset_urls['logo_dark'], sleeve_dark_path)
-                if success:
-                    results['sleeve_dark'] = sleeve_dark_path
+                tasks.append(('sleeve_dark', self.compose_sleeve,
+                              (asset_urls['logo_dark'], sleeve_dark_path, layout.get('sleeve_dark')), sleeve_dark_path))
             
             # 5. SLEEVE LIGHT (per capi scuri - logo chiaro)
             if asset_urls.get('logo_light'):
                 sleeve_light_path = os.path.join(product_dir, f"{slug}_sleeve_light.png")
-                success = self.compose_sleeve(asset_urls['logo_light'], sleeve_light_path)
-                if success:
-                    results['sleeve_light'] = sleeve_light_path
+                tasks.append(('sleeve_light', self.compose_sleeve,
+                              (asset_urls['logo_light'], sleeve_light_path, layout.get('sleeve_light')), sleeve_light_path))
+            
+            # Composizioni indipendenti: resize/paste/save PIL rilasciano il GIL
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [(key, executor.submit(fn, *args), path) for key, fn, args, path in tasks]
+                for key, future, path in futures:
+                    if future.result():
+                        results[key] = path
             
             # Summary
             successful = sum(1 for path in results.values() if path is not None)
-            print(f"\n📊 RISULTATI: {successful}/5 composizioni create")
+            logger.info("\n📊 RISULTATI: %s/5 composizioni create", successful)
             
             return results
             
         except Exception as e:
-            print(f"❌ Errore creazione varianti: {e}")
+            logger.error("❌ Errore creazione varianti: %s", e)
             return results
 
 def validate_composition(image_path: str, canvas_type: str = 'main') -> Dict[str, any]:
@@ -407,12 +729,15 @@ def validate_composition(image_path: str, canvas_type: str = 'main') -> Dict[str
     }
     
     try:
-        if not os.path.exists(image_path):
+        # Un solo stat per esistenza e dimensione file
+        try:
+            file_size = os.stat(image_path).st_size
+        except FileNotFoundError:
             result['valid'] = False
             result['issues'].append("File non esistente")
             return result
         
-        # Carica immagine
+        # Solo header: size e mode non richiedono la decodifica dei pixel
         with Image.open(image_path) as img:
             # Controlla dimensioni canvas
             expected_size = (CANVAS_TEMPLATES[canvas_type]['width'], 
@@ -427,13 +752,12 @@ def validate_composition(image_path: str, canvas_type: str = 'main') -> Dict[str
                 result['warnings'].append(f"Modalità {img.mode}, consigliata RGBA")
             
             # Dimensioni file
-            file_size = os.path.getsize(image_path)
             result['stats']['file_size_mb'] = file_size / (1024 * 1024)
             
             if file_size > 50 * 1024 * 1024:  # 50MB
                 result['warnings'].append(f"File grande: {result['stats']['file_size_mb']:.1f}MB")
         
-        print(f"🔍 Validazione {os.path.basename(image_path)}: {'✅' if result['valid'] else '❌'}")
+        logger.info("🔍 Validazione %s: %s", os.path.basename(image_path), '✅' if result['valid'] else '❌')
         
     except Exception as e:
         result['valid'] = False
@@ -1,68 +1,202 @@
 # utils/font_renderer.py - Font renderer adattato per OnlyOne workflow
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageFont
+import numpy as np
 import math
 import os
+import logging
 import re
 import json
 import glob
+from functools import lru_cache
 from typing import Dict, Tuple, Optional, List
 
-def draw_curved_text(text: str, font_path: str, font_size: int, 
-                    image_size: Tuple[int, int] = (2400, 800), 
-                    curve_strength: float = -0.60, 
-                    color: Tuple[int, int, int, int] = (0, 0, 0, 255)) -> Image.Image:
+from utils.text_utils import generate_kebab_slug, extract_title_from_slug
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=16)
+def _load_font(font_path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    """Carica il font TTF una sola volta per (path, size) nel processo."""
+    return ImageFont.truetype(font_path, font_size)
+
+@lru_cache(maxsize=256)
+def _char_width(font: ImageFont.FreeTypeFont, char: str) -> int:
+    """Larghezza di avanzamento di un carattere (cache per font)."""
+    return font.getbbox(char)[2]
+
+def _render_glyph(char: str, font: ImageFont.FreeTypeFont, font_size: int) -> Tuple[np.ndarray, Tuple[int, int]]:
     """
-    Disegna testo curvato con Libre Bodoni.
-    Adattato per OnlyOne workflow con curvatura configurabile.
+    Renderizza la copertura (0..1) di una lettera centrata su canvas (font_size*2)².
+    Usa la bitmap stretta di font.getmask2 (niente canvas glifo da riempire),
+    ritagliata al bounding box dell'inchiostro.
+    
+    Returns:
+        (coverage float32 (h, w), (x0, y0) offset del ritaglio nel canvas del glifo)
+    """
+    mask, (off_x, off_y) = font.getmask2(char, anchor="mm")
+    if mask.size[0] == 0 or mask.size[1] == 0:
+        return np.zeros((0, 0), dtype=np.float32), (0, 0)
+
+    mask_img = Image.frombytes("L", mask.size, bytes(mask))
+    bbox = mask_img.getbbox()
+    if bbox is None:  # Spazi e caratteri senza inchiostro
+        return np.zeros((0, 0), dtype=np.float32), (0, 0)
+
+    coverage = np.asarray(mask_img.crop(bbox), dtype=np.float32) / 255.0
+    return coverage, (font_size + off_x + bbox[0], font_size + off_y + bbox[1])
+
+def _composite_rotated_glyph(canvas: np.ndarray, coverage: np.ndarray,
+                             cx: float, cy: float, gcx: float, gcy: float,
+                             cos_a: float, sin_a: float, opacity: float = 1.0):
+    """
+    Compone in-place una maschera di glifo ruotata sul canvas di copertura.
+    Campionamento inverso affine con interpolazione bilineare, vettorizzato
+    con NumPy sul solo bounding box ruotato del glifo.
+    
+    Args:
+        canvas: Copertura float32 (H, W) del testo, modificata in-place
+        coverage: Maschera glifo float32 (h, w) 0..1
+        cx, cy: Centro di rotazione sul canvas
+        gcx, gcy: Centro di rotazione nella maschera del glifo
+        cos_a, sin_a: Coseno e seno dell'angolo di rotazione
+        opacity: Alpha del colore (0..1)
+    """
+    gh, gw = coverage.shape
+    if gh == 0 or gw == 0:
+        return
+
+    canvas_h, canvas_w = canvas.shape
+
+    # Bounding box ruotato del glifo sul canvas
+    corners_x = np.array([0, gw, gw, 0], dtype=np.float64) - gcx
+    corners_y = np.array([0, 0, gh, gh], dtype=np.float64) - gcy
+    xs_c = cx + cos_a * corners_x + sin_a * corners_y
+    ys_c = cy - sin_a * corners_x + cos_a * corners_y
+
+    x0 = max(0, int(math.floor(xs_c.min())) - 1)
+    x1 = min(canvas_w, int(math.ceil(xs_c.max())) + 1)
+    y0 = max(0, int(math.floor(ys_c.min())) - 1)
+    y1 = min(canvas_h, int(math.ceil(ys_c.max())) + 1)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    # Coordinate sorgente (centro pixel) per ogni pixel di destinazione
+    dx = np.arange(x0, x1, dtype=np.float32) + 0.5 - cx
+    dy = np.arange(y0, y1, dtype=np.float32)[:, None] + 0.5 - cy
+    sx = cos_a * dx - sin_a * dy + (gcx - 0.5)
+    sy = sin_a * dx + cos_a * dy + (gcy - 0.5)
+
+    # Bilineare su maschera con bordo di 1px a zero
+    padded = np.pad(coverage, 1)
+    ix = np.floor(sx)
+    iy = np.floor(sy)
+    fx = sx - ix
+    fy = sy - iy
+    ix = np.clip(ix.astype(np.intp) + 1, 0, gw)
+    iy = np.clip(iy.astype(np.intp) + 1, 0, gh)
+    inside = (sx > -1) & (sx < gw) & (sy > -1) & (sy < gh)
+
+    top = padded[iy, ix] * (1 - fx) + padded[iy, ix + 1] * fx
+    bottom = padded[iy + 1, ix] * (1 - fx) + padded[iy + 1, ix + 1] * fx
+    src_a = np.where(inside, top * (1 - fy) + bottom * fy, 0) * opacity
+
+    # Alpha-over: out_a = sa + da * (1 - sa)
+    region = canvas[y0:y1, x0:x1]
+    region *= 1 - src_a
+    region += src_a
+
+def draw_curved_text_multi(text: str, font_path: str, font_size: int,
+                           colors: List[Tuple[int, int, int, int]],
+                           image_size: Tuple[int, int] = (2400, 800),
+                           curve_strength: float = -0.60) -> List[Image.Image]:
+    """
+    Disegna lo stesso testo curvato in più colori con un solo passaggio.
+    Posizioni e angoli delle lettere sono calcolati una volta e condivisi
+    tra tutti i colori; ogni glifo viene renderizzato una sola volta.
     
     Args:
         text: Testo da renderizzare
         font_path: Path del font Libre Bodoni
         font_size: Dimensione font in pixel
+        colors: Lista colori RGBA (un'immagine per colore)
         image_size: Dimensioni canvas (width, height)
         curve_strength: Intensità curvatura (negativo=curva verso basso)
-        color: Colore RGBA
         
     Returns:
-        PIL Image con testo curvato e sfondo trasparente
+        Lista di PIL Image, una per colore, nello stesso ordine di colors
     """
     w, h = image_size
     center_x = w // 2
     center_y = h // 2 + 50  # Compensazione verticale 
 
     try:
-        font = ImageFont.truetype(font_path, font_size)
+        font = _load_font(font_path, font_size)
     except Exception as e:
-        print(f"❌ Errore caricamento font {font_path}: {e}")
+        logger.error("❌ Errore caricamento font %s: %s", font_path, e)
         # Fallback a font di sistema
         font = ImageFont.load_default()
 
-    # Calcola la larghezza totale del testo
-    text_width = sum(font.getbbox(char)[2] for char in text)
+    # Larghezze calcolate una sola volta e riusate nel loop di composizione
+    widths = [_char_width(font, char) for char in text]
+    text_width = sum(widths)
     radius = text_width / (2 * math.pi * abs(curve_strength) if abs(curve_strength) > 0 else 0.01)
 
-    current_x = -text_width / 2
-
-    img = Image.new("RGBA", (w, h), (255, 255, 255, 0))
-    for char in text:
-        char_width = font.getbbox(char)[2]
-        angle = (current_x + char_width / 2) / radius
+    # Posizioni e angoli di tutte le lettere in un unico passaggio vettoriale
+    widths_arr = np.array(widths, dtype=np.float64)
+    char_centers = np.cumsum(widths_arr) - widths_arr / 2 - text_width / 2
+    angles = char_centers / radius
+    sin_angles, cos_angles = np.sin(angles), np.cos(angles)
+    xs = center_x + radius * sin_angles
+    ys = center_y + (radius * (1 - cos_angles)) * (-1 if curve_strength < 0 else 1)
 
-        x = center_x + radius * math.sin(angle)
-        y = center_y + (radius * (1 - math.cos(angle))) * (-1 if curve_strength < 0 else 1)
+    # Testo monocolore: basta accumulare la copertura, una per ogni alpha colore
+    coverages = {color[3]: np.zeros((h, w), dtype=np.float32) for color in colors}
+    glyphs = {}
+    for char, x, y, cos_a, sin_a in zip(text, xs.tolist(), ys.tolist(),
+                                        cos_angles.tolist(), sin_angles.tolist()):
+        # Glifo renderizzato una sola volta per carattere
+        if char not in glyphs:
+            glyphs[char] = _render_glyph(char, font, font_size)
+        mask, (off_x, off_y) = glyphs[char]
 
-        # Crea immagine singola della lettera
-        char_img = Image.new("RGBA", (font_size * 2, font_size * 2), (255, 255, 255, 0))
-        char_draw = ImageDraw.Draw(char_img)
-        char_draw.text((font_size, font_size), char, font=font, fill=color, anchor="mm")
+        # Centro di rotazione: centro del canvas glifo (font_size, font_size)
+        cx = int(x - font_size) + font_size
+        cy = int(y - font_size) + font_size
+        for color_alpha, canvas in coverages.items():
+            _composite_rotated_glyph(canvas, mask, cx, cy, font_size - off_x, font_size - off_y,
+                                     cos_a, sin_a, color_alpha / 255.0)
 
-        # Ruota e compone
-        rotated = char_img.rotate(math.degrees(angle), resample=Image.Resampling.BICUBIC, center=(font_size, font_size))
-        img.alpha_composite(rotated, (int(x - font_size), int(y - font_size)))
+    images = []
+    for color in colors:
+        alpha = np.rint(coverages[color[3]] * 255).astype(np.uint8)
+        rgba = np.empty((h, w, 4), dtype=np.uint8)
+        rgba[..., :3] = np.where(alpha[..., None] > 0, np.array(color[:3], dtype=np.uint8), 255)
+        rgba[..., 3] = alpha
+        images.append(Image.fromarray(rgba, "RGBA"))
 
-        current_x += char_width
+    return images
 
-    return img
+def draw_curved_text(text: str, font_path: str, font_size: int, 
+                    image_size: Tuple[int, int] = (2400, 800), 
+                    curve_strength: float = -0.60, 
+                    color: Tuple[int, int, int, int] = (0, 0, 0, 255)) -> Image.Image:
+    """
+    Disegna testo curvato con Libre Bodoni.
+    Adattato per OnlyOne workflow con curvatura configurabile.
+    
+    Args:
+        text: Testo da renderizzare
+        font_path: Path del font Libre Bodoni
+        font_size: Dimensione font in pixel
+        image_size: Dimensioni canvas (width, height)
+        curve_strength: Intensità curvatura (negativo=curva verso basso)
+        color: Colore RGBA
+        
+    Returns:
+        PIL Image con testo curvato e sfondo trasparente
+    """
+    return draw_curved_text_multi(text, font_path, font_size, [color],
+                                  image_size=image_size, curve_strength=curve_strength)[0]
 
 def render_title_with_libre_bodoni(title: str, output_dir: str = "artifacts") -> Dict[str, str]:
     """
@@ -76,8 +210,7 @@ def render_title_with_libre_bodoni(title: str, output_dir: str = "artifacts") ->
     Returns:
         Dict con path dei file generati: {'dark': path, 'light': path}
     """
-    from config_printful import LIBRE_BODONI_FONT, CONTRAST_COLORS
-    from utils.text_utils import generate_kebab_slug
+    from config_printful import LIBRE_BODONI_FONT, CONTRAST_COLORS, PNG_SAVE_OPTS
     
     # Configurazione da config
     font_path = LIBRE_BODONI_FONT['regular']
@@ -94,29 +227,30 @@ def render_title_with_libre_bodoni(title: str, output_dir: str = "artifacts") ->
     # Crea directory output
     os.makedirs(output_dir, exist_ok=True)
     
-    print(f"🎨 Rendering titolo: '{title}' (slug: {slug})")
+    logger.info("🎨 Rendering titolo: '%s' (slug: %s)", title, slug)
     
     try:
         # Verifica font esistente
         if not os.path.exists(font_path):
-            print(f"⚠️ Font non trovato: {font_path}")
-            print(f"   Cerca in: {os.path.join('assets', 'fonts', 'Libre_Bodoni', 'static', 'LibreBodoni-Regular.ttf')}")
+            logger.warning("⚠️ Font non trovato: %s", font_path)
+            logger.info("   Cerca in: %s", os.path.join('assets', 'fonts', 'Libre_Bodoni', 'static', 'LibreBodoni-Regular.ttf'))
             return {'dark': None, 'light': None}
         
-        # Genera immagini
-        img_dark = draw_curved_text(title, font_path, font_size, color=dark_color, curve_strength=curve_strength)
-        img_light = draw_curved_text(title, font_path, font_size, color=light_color, curve_strength=curve_strength)
+        # Genera immagini (dark + light in un solo passaggio)
+        img_dark, img_light = draw_curved_text_multi(
+            title, font_path, font_size, [dark_color, light_color], curve_strength=curve_strength
+        )
         
         # Path output
         dark_path = os.path.join(output_dir, f"{slug}_title_dark.png")
         light_path = os.path.join(output_dir, f"{slug}_title_light.png")
         
         # Salvataggio
-        img_dark.save(dark_path, "PNG", optimize=True)
-        img_light.save(light_path, "PNG", optimize=True)
+        img_dark.save(dark_path, "PNG", **PNG_SAVE_OPTS)
+        img_light.save(light_path, "PNG", **PNG_SAVE_OPTS)
         
-        print(f"  ✅ Dark: {os.path.basename(dark_path)}")
-        print(f"  ✅ Light: {os.path.basename(light_path)}")
+        logger.info("  ✅ Dark: %s", os.path.basename(dark_path))
+        logger.info("  ✅ Light: %s", os.path.basename(light_path))
         
         return {
             'dark': dark_path,
@@ -126,12 +260,57 @@ def render_title_with_libre_bodoni(title: str, output_dir: str = "artifacts") ->
         }
         
     except Exception as e:
-        print(f"❌ Errore rendering titolo '{title}': {e}")
+        logger.error("❌ Errore rendering titolo '%s': %s", title, e)
         return {'dark': None, 'light': None}
 
+def _read_metadata_file(json_file: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    Legge un singolo JSON di metadati.
+    
+    Returns:
+        (json_file, original_title o None, messaggio di errore o None)
+    """
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return json_file, data.get('title', data.get('name', '')) or None, None
+    except Exception as e:
+        return json_file, None, str(e)
+
+@lru_cache(maxsize=4)
+def _load_metadata_cached(metadata_dir: str, json_files: Tuple[str, ...],
+                          latest_mtime: float) -> Dict[str, str]:
+    """
+    Carica in parallelo i JSON di metadati. Memoizzata su (directory, file, mtime più recente):
+    qualsiasi modifica, aggiunta o rimozione di un JSON invalida la cache.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    metadata_mapping = {}
+    
+    # Lettura/parsing concorrente, log e mapping nell'ordine originale dei file
+    with ThreadPoolExecutor(max_workers=min(8, len(json_files) or 1)) as executor:
+        results = list(executor.map(_read_metadata_file, json_files))
+    
+    for json_file, original_title, error in results:
+        if error:
+            logger.error("  ❌ Errore nel caricare %s: %s", json_file, error)
+        elif original_title:
+            # Usa il nome del file JSON come chiave, slug compatibile OnlyOne
+            json_filename = os.path.splitext(os.path.basename(json_file))[0]
+            slug_key = generate_kebab_slug(json_filename)
+            
+            metadata_mapping[slug_key] = original_title
+            logger.info("  ✅ %s -> %s", slug_key, original_title)
+        else:
+            logger.warning("  ⚠️ Titolo non trovato in %s", json_file)
+    
+    return metadata_mapping
+
 def load_metadata_from_json(metadata_dir: str = "fase1/output/generated_metadati") -> Dict[str, str]:
     """
     Carica i metadati dai file JSON (compatibilità con sistema esistente).
+    Il risultato è memoizzato finché i JSON della directory non cambiano.
     
     Args:
         metadata_dir: Directory contenente i file JSON dei metadati
@@ -139,42 +318,23 @@ def load_metadata_from_json(metadata_dir: str = "fase1/output/generated_metadati
     Returns:
         Dict con mapping filename_slug -> original_title
     """
-    metadata_mapping = {}
-    
     if not os.path.exists(metadata_dir):
-        print(f"⚠️ Directory metadati non trovata: {metadata_dir}")
-        return metadata_mapping
+        logger.warning("⚠️ Directory metadati non trovata: %s", metadata_dir)
+        return {}
     
     # Trova tutti i file JSON nella directory
-    json_files = glob.glob(os.path.join(metadata_dir, "*.json"))
+    json_files = tuple(sorted(glob.glob(os.path.join(metadata_dir, "*.json"))))
     
-    print(f"📄 Trovati {len(json_files)} file JSON di metadati")
+    logger.info("📄 Trovati %s file JSON di metadati", len(json_files))
     
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # Estrai il titolo originale dal JSON
-            original_title = data.get('title', data.get('name', ''))
-            
-            if original_title:
-                # Usa il nome del file JSON come chiave
-                json_filename = os.path.splitext(os.path.basename(json_file))[0]
-                
-                # Genera slug compatibile OnlyOne
-                from utils.text_utils import generate_kebab_slug
-                slug_key = generate_kebab_slug(json_filename)
-                
-                metadata_mapping[slug_key] = original_title
-                print(f"  ✅ {slug_key} -> {original_title}")
-            else:
-                print(f"  ⚠️ Titolo non trovato in {json_file}")
-                
-        except Exception as e:
-            print(f"  ❌ Errore nel caricare {json_file}: {e}")
+    try:
+        latest_mtime = max((os.path.getmtime(f) for f in json_files), default=0.0)
+    except OSError:
+        # File rimosso durante la scansione: lettura senza cache
+        return _load_metadata_cached.__wrapped__(metadata_dir, json_files, 0.0)
     
-    return metadata_mapping
+    # Copia: i chiamanti possono modificare il mapping senza sporcare la cache
+    return dict(_load_metadata_cached(metadata_dir, json_files, latest_mtime))
 
 def extract_title_from_filename(filename: str, metadata_mapping: Optional[Dict[str, str]] = None) -> str:
     """
@@ -187,8 +347,6 @@ def extract_title_from_filename(filename: str, metadata_mapping: Optional[Dict[s
     Returns:
         Titolo formattato per display
     """
-    from utils.text_utils import generate_kebab_slug, extract_title_from_slug
-    
     # Rimuovi estensione
     base_name = os.path.splitext(os.path.basename(filename))[0]
     
@@ -198,29 +356,82 @@ def extract_title_from_filename(filename: str, metadata_mapping: Optional[Dict[s
     # Cerca nei metadati se disponibili
     if metadata_mapping and slug in metadata_mapping:
         title = metadata_mapping[slug]
-        print(f"📖 Titolo da metadati: '{title}'")
+        logger.info("📖 Titolo da metadati: '%s'", title)
         return title
     
     # Fallback: estrai da slug
     title = extract_title_from_slug(slug)
-    print(f"📝 Titolo da slug: '{title}'")
+    logger.info("📝 Titolo da slug: '%s'", title)
     return title
 
+def _warm_title_worker(log_queue=None, log_level: int = logging.INFO):
+    """
+    Initializer dei worker: inoltra i log al processo principale tramite coda
+    e carica il font dei titoli una volta per processo.
+    """
+    from config_printful import LIBRE_BODONI_FONT
+    if log_queue is not None:
+        from logging.handlers import QueueHandler
+        root = logging.getLogger()
+        root.handlers[:] = [QueueHandler(log_queue)]
+        root.setLevel(log_level)
+    try:
+        _load_font(LIBRE_BODONI_FONT['regular'], 180)
+    except Exception:
+        pass  # render_title_with_libre_bodoni gestisce il fallback
+
+def _render_one(image_file: str, metadata_mapping: Dict[str, str], output_dir: str) -> Dict:
+    """
+    Genera i titoli dark/light per una singola immagine (eseguibile in un worker).
+    
+    Returns:
+        Dict risultato per l'immagine
+    """
+    filename = os.path.basename(image_file)
+    logger.info("\n📁 Processando: %s", filename)
+    
+    try:
+        # Estrai titolo da file/metadati
+        title = extract_title_from_filename(filename, metadata_mapping)
+        
+        # Genera titoli
+        result = render_title_with_libre_bodoni(title, output_dir)
+        
+        return {
+            'success': result['dark'] is not None and result['light'] is not None,
+            'title': title,
+            'slug': result.get('slug'),
+            'dark_path': result.get('dark'),
+            'light_path': result.get('light')
+        }
+        
+    except Exception as e:
+        logger.error("❌ Errore processando %s: %s", filename, e)
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
 def batch_generate_titles_for_images(image_files: List[str], 
                                     output_dir: str = "artifacts",
-                                    metadata_dir: Optional[str] = None) -> Dict[str, Dict]:
+                                    metadata_dir: Optional[str] = None,
+                                    max_workers: Optional[int] = None) -> Dict[str, Dict]:
     """
     Genera titoli per lista di immagini.
-    Integrato con workflow OnlyOne.
+    Integrato con workflow OnlyOne. Il rendering è CPU-bound, quindi le
+    immagini sono distribuite su un pool di processi.
     
     Args:
         image_files: Lista path immagini
         output_dir: Directory output
         metadata_dir: Directory metadati JSON (opzionale)
+        max_workers: Numero processi (default: CPU disponibili)
         
     Returns:
         Dict con risultati generazione per ogni file
     """
+    from concurrent.futures import ProcessPoolExecutor
+    
     results = {}
     
     # Carica metadati se disponibili
@@ -228,38 +439,42 @@ def batch_generate_titles_for_images(image_files: List[str],
     if metadata_dir and os.path.exists(metadata_dir):
         metadata_mapping = load_metadata_from_json(metadata_dir)
     
-    print(f"\n🎨 GENERAZIONE TITOLI PER {len(image_files)} IMMAGINI")
-    print("="*50)
+    logger.info("\n🎨 GENERAZIONE TITOLI PER %s IMMAGINI", len(image_files))
+    logger.info("="*50)
     
-    for image_file in image_files:
-        filename = os.path.basename(image_file)
-        print(f"\n📁 Processando: {filename}")
+    if len(image_files) <= 1 or max_workers == 1:
+        # Nessun vantaggio dal pool: evita l'avvio dei processi
+        for image_file in image_files:
+            results[image_file] = _render_one(image_file, metadata_mapping, output_dir)
+    else:
+        import multiprocessing
+        from logging.handlers import QueueListener
         
+        # Log dei worker raccolti su una coda e scritti dagli handler del processo principale
+        root = logging.getLogger()
+        log_queue = multiprocessing.Queue()
+        listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+        listener.start()
         try:
-            # Estrai titolo da file/metadati
-            title = extract_title_from_filename(filename, metadata_mapping)
-            
-            # Genera titoli
-            result = render_title_with_libre_bodoni(title, output_dir)
-            
-            results[image_file] = {
-                'success': result['dark'] is not None and result['light'] is not None,
-                'title': title,
-                'slug': result.get('slug'),
-                'dark_path': result.get('dark'),
-                'light_path': result.get('light')
-            }
-            
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_title_worker,
+                                     initargs=(log_queue, root.getEffectiveLevel())) as executor:
+                batch = executor.map(_render_one, image_files,
+                                     [metadata_mapping] * len(image_files),
+                                     [output_dir] * len(image_files))
+                for image_file, result in zip(image_files, batch):
+                    results[image_file] = result
         except Exception as e:
-            print(f"❌ Errore processando {filename}: {e}")
-            results[image_file] = {
-                'success': False,
-                'error': str(e)
-            }
+            # Pool non disponibile (es. ambiente senza fork/semafori): fallback sequenziale
+            logger.warning("⚠️ Pool processi non disponibile (%s), generazione sequenziale", e)
+            for image_file in image_files:
+                if image_file not in results:
+                    results[image_file] = _render_one(image_file, metadata_mapping, output_dir)
+        finally:
+            listener.stop()
     
     # Summary
     successful = sum(1 for r in results.values() if r.get('success'))
-    print(f"\n📊 RISULTATI: {successful}/{len(image_files)} titoli generati")
+    logger.info("\n📊 RISULTATI: %s/%s titoli generati", successful, len(image_files))
     
     return results
 
@@ -1,36 +1,180 @@
 # utils/image_server.py - Versione Ottimizzata
+import mmap
 import os
+import select
 import threading
-import time
 import mimetypes
+import stat
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import unquote
+from socketserver import ThreadingMixIn
+from urllib.parse import quote, unquote, urlsplit
 import socket
 
+# Estensioni servite abitualmente: un solo lookup dict invece di mimetypes.guess_type
+EXT_TO_MIME = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp',
+    '.tif': 'image/tiff',
+    '.tiff': 'image/tiff',
+    '.bmp': 'image/bmp',
+    '.svg': 'image/svg+xml',
+}
+
+@lru_cache(maxsize=4096)
+def _resolve(image_directory: str, path: str) -> Tuple[Optional[str], str]:
+    """
+    Risolve un path URL (già decodificato) nel path assoluto del file e nel suo MIME type.
+    Dipende solo dalle stringhe, quindi è memoizzabile; esistenza e dimensione
+    del file vanno verificate a ogni richiesta con os.stat.
+    
+    Returns:
+        (abs_path o None se fuori da image_directory, mime_type)
+    """
+    abs_path = os.path.abspath(os.path.join(image_directory, path))
+    if not abs_path.startswith(image_directory):
+        return None, ''
+    
+    ext = os.path.splitext(abs_path)[1].lower()
+    mime_type = EXT_TO_MIME.get(ext)
+    if mime_type is None:
+        mime_type = mimetypes.guess_type(abs_path)[0] or 'application/octet-stream'
+    return abs_path, mime_type
+
+def _walk_files(root: str) -> Iterator[Tuple[str, str]]:
+    """
+    Genera (nome, path) dei file sotto root con os.scandir: il tipo arriva dal DirEntry,
+    senza stat() per file. Come os.walk: prima i file della directory, poi le
+    sottodirectory; directory illeggibili ignorate.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry.name, entry.path
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _walk_files(subdir)
+
+class FastHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    HTTPServer multi-thread con socket ottimizzati per bassa latenza.
+    Una connessione per thread; al massimo max_workers richieste in elaborazione
+    contemporaneamente (le connessioni keep-alive inattive non occupano slot).
+    """
+    daemon_threads = True
+    request_queue_size = 128
+    max_workers = 16
+    send_buffer_size = 1 << 20  # 1 MiB
+    notsent_lowat = 128 * 1024
+    
+    def __init__(self, *args, **kwargs):
+        self._workers = threading.BoundedSemaphore(self.max_workers)
+        self.ready = threading.Event()
+        super().__init__(*args, **kwargs)
+    
+    def server_activate(self):
+        """Segnala la disponibilità appena il socket è in ascolto"""
+        super().server_activate()
+        self.ready.set()
+    
+    def process_request(self, request, client_address):
+        """Ottimizza il socket accettato e lo affida a un thread worker"""
+        try:
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Buffer di invio ampio: sendfile mantiene in volo un BDP intero di PNG
+            request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+            # Linux: limita i byte non ancora inviati in coda senza frenare la congestion window
+            if hasattr(socket, 'TCP_NOTSENT_LOWAT'):
+                request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NOTSENT_LOWAT, self.notsent_lowat)
+        except OSError:
+            pass
+        super().process_request(request, client_address)
+
 class OptimizedImageHandler(BaseHTTPRequestHandler):
     """Handler HTTP ottimizzato per servire immagini velocemente"""
     
+    # Connessioni persistenti: più immagini sulla stessa connessione TCP
+    protocol_version = 'HTTP/1.1'
+    # Chiude presto le connessioni keep-alive inattive (un thread ciascuna)
+    timeout = 5
+    # Primo blocco del body inviato insieme agli headers (file piccoli: risposta intera)
+    head_chunk_size = 65536
+    
+    def handle_one_request(self):
+        """
+        Gestisce una richiesta con TCP_CORK attivo (Linux): headers e primo
+        blocco del body partono nello stesso pacchetto, flush al termine.
+        """
+        self._set_cork(True)
+        try:
+            super().handle_one_request()
+        except (ConnectionResetError, BrokenPipeError):
+            # Client keep-alive disconnesso tra una richiesta e l'altra
+            self.close_connection = True
+        finally:
+            self._set_cork(False)
+    
+    def _set_cork(self, enabled: bool):
+        """Attiva/disattiva TCP_CORK se supportato dalla piattaforma"""
+        if not hasattr(socket, 'TCP_CORK'):
+            return
+        try:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, int(enabled))
+        except OSError:
+            pass  # Connessione già chiusa
+    
     def do_GET(self):
         """Gestisce le richieste GET per le immagini"""
+        self._serve_image(send_body=True)
+    
+    def do_HEAD(self):
+        """Gestisce le richieste HEAD (solo headers, usate per verificare l'accesso)"""
+        self._serve_image(send_body=False)
+    
+    def _serve_image(self, send_body: bool):
+        """Serve la richiesta occupando uno slot worker solo per la sua durata"""
+        workers = self.server._workers
+        if not workers.acquire(blocking=False):
+            # Server saturo: questa risposta chiude la connessione, il client
+            # non resta agganciato a un thread mentre altri attendono
+            self.close_connection = True
+            workers.acquire()
+        try:
+            self._send_image(send_body)
+        finally:
+            workers.release()
+    
+    def _send_image(self, send_body: bool):
+        """Risponde con headers ed eventualmente il contenuto dell'immagine richiesta"""
         try:
-            # Decodifica l'URL
+            # Decodifica l'URL e risolvi path/MIME (memoizzato)
             path = unquote(self.path.lstrip('/'))
-            file_path = os.path.join(self.server.image_directory, path)
+            file_path, mime_type = _resolve(self.server.image_directory, path)
             
             # Verifica sicurezza
-            if not os.path.abspath(file_path).startswith(self.server.image_directory):
+            if file_path is None:
                 self.send_error(403, "Accesso negato")
                 return
             
-            if not (os.path.exists(file_path) and os.path.isfile(file_path)):
+            # Un solo stat per esistenza, tipo e dimensione
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                st = None
+            if st is None or not stat.S_ISREG(st.st_mode):
                 self.send_error(404, "File non trovato")
                 return
             
-            # Ottieni info file
-            file_size = os.path.getsize(file_path)
-            mime_type, _ = mimetypes.guess_type(file_path)
-            if mime_type is None:
-                mime_type = 'application/octet-stream'
+            file_size = st.st_size
             
             # Invia headers ottimizzati
             self.send_response(200)
@@ -39,21 +183,27 @@ class OptimizedImageHandler(BaseHTTPRequestHandler):
             self.send_header('Accept-Ranges', 'bytes')
             self.send_header('Cache-Control', 'public, max-age=3600')
             self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
+            # HTTP/1.1 (o client 1.0 con keep-alive): connessione riutilizzabile,
+            # salvo server saturo
+            self.send_header('Connection', 'close' if self.close_connection else 'keep-alive')
+            headers = self._take_headers()
+            
+            if not send_body:
+                self.wfile.write(headers)
+                return
             
-            # Invia file in chunks per evitare timeout
             with open(file_path, 'rb') as f:
-                chunk_size = 65536  # 64KB chunks
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    try:
-                        self.wfile.write(chunk)
-                        self.wfile.flush()
-                    except BrokenPipeError:
-                        # Client ha chiuso la connessione
-                        break
+                # Headers + primo blocco in un'unica syscall, poi sendfile dal resto
+                head = f.read(self.head_chunk_size)
+                try:
+                    self._send_gathered([headers, head])
+                except (BrokenPipeError, ConnectionResetError, socket.timeout):
+                    self.close_connection = True
+                    return
+                
+                if self._send_file_body(f, file_size, len(head)) < file_size:
+                    # Body incompleto: la connessione non è più riutilizzabile
+                    self.close_connection = True
                         
         except Exception as e:
             try:
@@ -61,6 +211,106 @@ class OptimizedImageHandler(BaseHTTPRequestHandler):
             except:
                 pass  # Connessione già chiusa
     
+    def _take_headers(self) -> bytes:
+        """Chiude il blocco headers (come end_headers) e lo restituisce senza scriverlo"""
+        buffer = getattr(self, '_headers_buffer', [])
+        if self.request_version != 'HTTP/0.9':
+            buffer.append(b"\r\n")
+        self._headers_buffer = []
+        return b"".join(buffer)
+    
+    def _send_gathered(self, buffers):
+        """Invia più buffer con una sola sendmsg (scatter/gather), completando eventuali invii parziali"""
+        if not hasattr(self.connection, 'sendmsg'):
+            self.connection.sendall(b"".join(buffers))
+            return
+        
+        sent = self.connection.sendmsg(buffers)
+        total = sum(len(b) for b in buffers)
+        if sent < total:
+            self.connection.sendall(b"".join(buffers)[sent:])
+    
+    def _send_file_body(self, f, file_size: int, offset: int = 0) -> int:
+        """
+        Invia il contenuto del file sul socket.
+        Usa os.sendfile (zero-copy disco → socket) se disponibile,
+        altrimenti o in caso di errore prosegue con il loop read/write a chunk.
+        
+        Args:
+            f: File aperto in modalità binaria
+            file_size: Dimensione in byte da inviare
+            offset: Byte già inviati (es. insieme agli headers)
+            
+        Returns:
+            Byte effettivamente inviati
+        """
+        if offset >= file_size:
+            return offset
+        
+        if hasattr(os, 'sendfile'):
+            try:
+                out_fd = self.connection.fileno()
+                in_fd = f.fileno()
+                timeout = self.connection.gettimeout()
+                while offset < file_size:
+                    try:
+                        sent = os.sendfile(out_fd, in_fd, offset, file_size - offset)
+                    except BlockingIOError:
+                        # Socket con timeout (non bloccante): attendi spazio nel buffer di invio
+                        if not select.select([], [out_fd], [], timeout)[1]:
+                            return offset  # Client fermo oltre il timeout
+                        continue
+                    if sent == 0:
+                        break
+                    offset += sent
+                return offset
+            except (BrokenPipeError, ConnectionResetError):
+                # Client ha chiuso la connessione
+                return offset
+            except OSError:
+                # sendfile non supportato per questo socket/file (es. ENOSYS):
+                # continua dal primo byte non inviato
+                pass
+        
+        chunk_size = 65536  # 64KB chunks
+        
+        # Fallback: file mappato in memoria, i chunk arrivano al socket come
+        # memoryview sulle pagine del file, senza copie in nuovi bytes
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mm = None  # File non mappabile
+        
+        if mm is not None:
+            with mm, memoryview(mm) as view:
+                while offset < file_size:
+                    with view[offset:offset + chunk_size] as chunk:
+                        size = len(chunk)
+                        if not size:
+                            break  # File accorciato nel frattempo
+                        try:
+                            self.wfile.write(chunk)
+                        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+                            # Client ha chiuso la connessione
+                            break
+                    offset += size
+            return offset
+        
+        # Ultima risorsa: invia file in chunks per evitare timeout
+        f.seek(offset)
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            try:
+                self.wfile.write(chunk)
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError, socket.timeout):
+                # Client ha chiuso la connessione
+                break
+            offset += len(chunk)
+        return offset
+    
     def log_message(self, format, *args):
         """Log silenzioso per performance"""
         pass
@@ -75,6 +325,17 @@ class ImageServer:
         self.server_thread = None
         self.base_url = f"http://localhost:{self.port}"
         
+        # Indice basename -> path assoluto per get_image_url (un solo walk)
+        self._name_index = {}
+        self.refresh_index()
+        
+    def refresh_index(self):
+        """Ricostruisce l'indice dei file serviti (da chiamare se la directory cambia)"""
+        name_index = {}
+        for fname, path in _walk_files(self.image_directory):
+            name_index.setdefault(fname, path)
+        self._name_index = name_index
+    
     def _find_free_port(self, start_port: int = 8000) -> int:
         """Trova una porta libera"""
         for port in range(start_port, start_port + 50):
@@ -93,7 +354,7 @@ class ImageServer:
             return
         
         # Crea server ottimizzato
-        self.server = HTTPServer(('localhost', self.port), OptimizedImageHandler)
+        self.server = FastHTTPServer(('localhost', self.port), OptimizedImageHandler)
         self.server.image_directory = self.image_directory
         
         # Ottimizzazioni socket
@@ -107,8 +368,8 @@ class ImageServer:
         )
         self.server_thread.start()
         
-        # Verifica rapida
-        time.sleep(0.1)
+        # Il socket è in ascolto dalla costruzione: le connessioni attendono nel backlog
+        self.server.ready.wait(timeout=2)
         print(f"🚀 Server HTTP veloce avviato su {self.base_url}")
         
     def stop(self):
@@ -131,27 +392,37 @@ class ImageServer:
             if os.path.exists(potential_path):
                 abs_path = potential_path
             else:
-                # Cerca ricorsivamente
-                for root, dirs, files in os.walk(self.image_directory):
-                    if filename in files:
-                        abs_path = os.path.join(root, filename)
-                        break
-                else:
+                # Cerca nell'indice; file creato, spostato o eliminato dopo l'ultimo
+                # walk: ricostruisci una volta
+                indexed_path = self._name_index.get(filename)
+                if indexed_path is None or not os.path.exists(indexed_path):
+                    self.refresh_index()
+                    indexed_path = self._name_index.get(filename)
+                if indexed_path is None:
                     raise ValueError(f"Immagine non trovata: {image_path}")
+                abs_path = indexed_path
         
         relative_path = os.path.relpath(abs_path, self.image_directory)
         url_path = relative_path.replace('\\', '/')
         return f"{self.base_url}/{url_path}"
     
     def test_image_access(self, image_path: str) -> bool:
-        """Testa se un'immagine è accessibile via HTTP"""
+        """Testa se un'immagine è accessibile via HTTP (HEAD diretto sul socket loopback)"""
         try:
-            import requests
             url = self.get_image_url(image_path)
+            # Request line in ASCII: spazi e caratteri non ASCII percent-encoded
+            # (il handler fa unquote)
+            path = quote(urlsplit(url).path)
+            
+            # Server locale: niente client HTTP né risoluzione DNS, basta la status line
+            with socket.create_connection(('127.0.0.1', self.port), timeout=2) as s:
+                s.sendall(f"HEAD {path} HTTP/1.0\r\nHost: localhost\r\n\r\n".encode('ascii'))
+                with s.makefile('rb') as response:
+                    status_line = response.readline(256)
             
-            # Test veloce con timeout ridotto
-            response = requests.head(url, timeout=5)  # HEAD invece di GET
-            return response.status_code == 200
+            # Status line completa: "HTTP/1.x 200 <reason>\r\n"
+            parts = status_line.rstrip(b'\r\n').split(b' ', 2)
+            return len(parts) >= 2 and parts[0].startswith(b'HTTP/') and parts[1] == b'200'
         except Exception:
             return False
     
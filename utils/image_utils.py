@@ -1,16 +1,72 @@
 # utils/image_utils.py - Versione estesa con validazione OnlyOne
-from typing import Tuple, Dict, Optional
-from PIL import Image, ImageCms
+from typing import Tuple, Dict, List, Optional
+from PIL import Image, ImageCms, ImageDraw
+from functools import lru_cache
+import hashlib
+import io
 import os
-import numpy as np
+import struct
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Marker SOF JPEG (esclusi DHT 0xC4, JPG 0xC8, DAC 0xCC) che riportano le dimensioni
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _read_header_dimensions(image_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Legge larghezza/altezza direttamente dall'header PNG (IHDR) o JPEG (segmento SOF).
+    
+    Returns:
+        (width, height) o None se il formato non è riconosciuto
+    """
+    with open(image_path, 'rb') as f:
+        head = f.read(24)
+        
+        # PNG: IHDR è sempre il primo chunk, width/height ai byte 16-24
+        if head[:8] == _PNG_SIGNATURE and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        
+        # JPEG: scorri i segmenti fino al primo SOF
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            while True:
+                byte = f.read(1)
+                if not byte:
+                    return None
+                if byte != b'\xff':
+                    continue
+                marker = f.read(1)
+                while marker == b'\xff':  # Byte di riempimento
+                    marker = f.read(1)
+                if not marker:
+                    return None
+                code = marker[0]
+                if code == 0x01 or 0xD0 <= code <= 0xD9:
+                    continue  # Marker senza lunghezza
+                length_bytes = f.read(2)
+                if len(length_bytes) < 2:
+                    return None
+                length = struct.unpack('>H', length_bytes)[0]
+                if code in _JPEG_SOF_MARKERS:
+                    sof = f.read(5)
+                    if len(sof) < 5:
+                        return None
+                    height, width = struct.unpack('>HH', sof[1:5])
+                    return width, height
+                f.seek(length - 2, os.SEEK_CUR)
+    
+    return None
 
 def get_image_dimensions(image_path: str) -> Tuple[int, int]:
     """Ottiene le dimensioni reali dell'immagine in pixel"""
     try:
-        with Image.open(image_path) as img:
-            width, height = img.size
-            print(f"📏 Dimensioni {os.path.basename(image_path)}: {width}x{height} px")
-            return width, height
+        # Header PNG/JPEG letto direttamente, PIL solo per altri formati
+        dimensions = _read_header_dimensions(image_path)
+        if dimensions is None:
+            with Image.open(image_path) as img:
+                dimensions = img.size
+        width, height = dimensions
+        print(f"📏 Dimensioni {os.path.basename(image_path)}: {width}x{height} px")
+        return width, height
     except Exception as e:
         print(f"❌ Errore nel leggere le dimensioni di {image_path}: {str(e)}")
         return 0, 0
@@ -58,13 +114,91 @@ def calculate_print_file_dimensions(img_width: int, img_height: int,
 
 # ==================== ONLYONE VALIDATIONS ====================
 
-def validate_png_transparency(image_path: str) -> Dict[str, any]:
+def read_image_metadata(image_path: str) -> Dict[str, any]:
     """
-    Valida che l'immagine sia PNG con trasparenza
+    Legge una sola volta i metadati dell'immagine (solo header, nessuna decodifica pixel)
     
     Returns:
-        Dict con risultato validazione
+        Dict con format, mode, size, info oppure {'error': eccezione} se il file non si apre
+    """
+    try:
+        with Image.open(image_path) as img:
+            return {
+                'format': img.format,
+                'mode': img.mode,
+                'size': img.size,
+                'info': dict(img.info)
+            }
+    except Exception as e:
+        return {'error': e}
+
+# Descrizioni profili ICC già lette, per digest del payload (i profili si ripetono tra immagini)
+_ICC_DESCRIPTION_CACHE: Dict[bytes, Optional[str]] = {}
+
+def _parse_icc_description(icc_profile: bytes) -> Optional[str]:
+    """
+    Estrae il tag 'desc' direttamente dai byte del profilo ICC, senza inizializzare LCMS.
+    Supporta textDescriptionType (ICC v2) e multiLocalizedUnicodeType (ICC v4).
+    
+    Returns:
+        Descrizione del profilo o None se il tag non è leggibile
     """
+    if len(icc_profile) < 132 or icc_profile[36:40] != b'acsp':
+        return None
+    
+    # Tag table: conteggio a offset 128, poi voci (firma, offset, dimensione) da 12 byte
+    tag_count = struct.unpack_from('>I', icc_profile, 128)[0]
+    for i in range(min(tag_count, (len(icc_profile) - 132) // 12)):
+        signature, offset, size = struct.unpack_from('>4sII', icc_profile, 132 + i * 12)
+        if signature != b'desc':
+            continue
+        tag = icc_profile[offset:offset + size]
+        
+        if tag[:4] == b'desc' and len(tag) >= 12:
+            # v2: conteggio ASCII (incluso terminatore) a offset 8
+            count = struct.unpack_from('>I', tag, 8)[0]
+            return tag[12:12 + count].split(b'\x00', 1)[0].decode('latin-1')
+        
+        if tag[:4] == b'mluc' and len(tag) >= 16:
+            # v4: record (lingua, paese, lunghezza, offset) UTF-16BE, preferito en-US
+            record_count, record_size = struct.unpack_from('>II', tag, 8)
+            records = [struct.unpack_from('>2s2sII', tag, 16 + j * record_size)
+                       for j in range(record_count) if 16 + j * record_size + 12 <= len(tag)]
+            if not records:
+                return None
+            chosen = next((r for r in records if r[:2] == (b'en', b'US')), records[0])
+            _, _, length, str_offset = chosen
+            return tag[str_offset:str_offset + length].decode('utf-16-be').rstrip('\x00')
+        
+        return None
+    return None
+
+def _icc_profile_description(icc_profile: bytes) -> Optional[str]:
+    """
+    Descrizione del profilo ICC: cache per digest, poi parsing diretto del tag,
+    ImageCms (LCMS) solo se il tag non è leggibile.
+    
+    Raises:
+        Exception se neanche ImageCms riesce a leggere il profilo
+    """
+    digest = hashlib.md5(icc_profile).digest()
+    if digest in _ICC_DESCRIPTION_CACHE:
+        return _ICC_DESCRIPTION_CACHE[digest]
+    
+    try:
+        description = _parse_icc_description(icc_profile)
+    except (struct.error, UnicodeDecodeError):
+        description = None
+    
+    if description is None:
+        profile = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+        description = profile.profile.profile_description
+    
+    _ICC_DESCRIPTION_CACHE[digest] = description
+    return description
+
+def _validate_png_transparency(meta: Dict[str, any]) -> Dict[str, any]:
+    """Validazione PNG/trasparenza sui metadati già letti"""
     result = {
         'valid': False,
         'format': None,
@@ -73,48 +207,41 @@ def validate_png_transparency(image_path: str) -> Dict[str, any]:
         'issues': []
     }
     
-    try:
-        with Image.open(image_path) as img:
-            # Controlla formato
-            result['format'] = img.format
-            result['mode'] = img.mode
-            
-            if img.format != 'PNG':
-                result['issues'].append(f"Formato {img.format}, richiesto PNG")
-                return result
-            
-            # Controlla trasparenza (con auto-fix per RGB)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                if img.mode == 'P' and 'transparency' in img.info:
-                    result['has_transparency'] = True
-                elif img.mode in ('RGBA', 'LA'):
-                    result['has_transparency'] = True
-                else:
-                    result['issues'].append("PNG senza canale trasparenza")
-                    return result
-            elif img.mode == 'RGB':
-                # Auto-fix: RGB può essere convertito a RGBA
-                result['has_transparency'] = False  # Non ha trasparenza ora
-                result['needs_conversion'] = True   # Ma può essere convertita
-                print(f"    🔄 PNG RGB rilevato - conversione a RGBA disponibile")
-            else:
-                result['issues'].append(f"Modalità {img.mode} non supporta trasparenza")
-                return result
-            
-            result['valid'] = True
+    if 'error' in meta:
+        result['issues'].append(f"Errore apertura file: {meta['error']}")
+        return result
+    
+    # Controlla formato
+    result['format'] = meta['format']
+    result['mode'] = meta['mode']
+    
+    if meta['format'] != 'PNG':
+        result['issues'].append(f"Formato {meta['format']}, richiesto PNG")
+        return result
+    
+    # Controlla trasparenza (con auto-fix per RGB)
+    mode = meta['mode']
+    if mode in ('RGBA', 'LA', 'P'):
+        if mode == 'P' and 'transparency' in meta['info']:
+            result['has_transparency'] = True
+        elif mode in ('RGBA', 'LA'):
+            result['has_transparency'] = True
+        else:
+            result['issues'].append("PNG senza canale trasparenza")
             return result
-            
-    except Exception as e:
-        result['issues'].append(f"Errore apertura file: {e}")
+    elif mode == 'RGB':
+        # Auto-fix: RGB può essere convertito a RGBA
+        result['has_transparency'] = False  # Non ha trasparenza ora
+        result['needs_conversion'] = True   # Ma può essere convertita
+    else:
+        result['issues'].append(f"Modalità {mode} non supporta trasparenza")
         return result
-
-def validate_srgb_profile(image_path: str) -> Dict[str, any]:
-    """
-    Valida profilo colore sRGB
     
-    Returns:
-        Dict con risultato validazione
-    """
+    result['valid'] = True
+    return result
+
+def _validate_srgb_profile(meta: Dict[str, any]) -> Dict[str, any]:
+    """Validazione profilo sRGB sui metadati già letti"""
     result = {
         'valid': False,
         'profile_name': None,
@@ -122,44 +249,37 @@ def validate_srgb_profile(image_path: str) -> Dict[str, any]:
         'issues': []
     }
     
-    try:
-        with Image.open(image_path) as img:
-            # Controlla profilo ICC
-            if 'icc_profile' in img.info:
-                try:
-                    profile = ImageCms.ImageCmsProfile(img.info['icc_profile'])
-                    profile_name = profile.profile.profile_description
-                    result['profile_name'] = profile_name
-                    
-                    # Controlla se è sRGB (vari nomi possibili)
-                    srgb_indicators = ['sRGB', 'srgb', 'SRGB', 'IEC61966', 'Adobe RGB']
-                    result['is_srgb'] = any(indicator in str(profile_name) for indicator in srgb_indicators)
-                    
-                    if result['is_srgb']:
-                        result['valid'] = True
-                    else:
-                        result['issues'].append(f"Profilo {profile_name} non è sRGB")
-                        
-                except Exception as e:
-                    result['issues'].append(f"Errore lettura profilo ICC: {e}")
-            else:
-                # Nessun profilo ICC - assumiamo sRGB per PNG web
-                result['is_srgb'] = True
+    if 'error' in meta:
+        result['issues'].append(f"Errore validazione profilo: {meta['error']}")
+        return result
+    
+    # Controlla profilo ICC
+    if 'icc_profile' in meta['info']:
+        try:
+            profile_name = _icc_profile_description(meta['info']['icc_profile'])
+            result['profile_name'] = profile_name
+            
+            # Controlla se è sRGB (vari nomi possibili)
+            srgb_indicators = ['sRGB', 'srgb', 'SRGB', 'IEC61966', 'Adobe RGB']
+            result['is_srgb'] = any(indicator in str(profile_name) for indicator in srgb_indicators)
+            
+            if result['is_srgb']:
                 result['valid'] = True
-                result['profile_name'] = "Nessun profilo (assumendo sRGB)"
+            else:
+                result['issues'].append(f"Profilo {profile_name} non è sRGB")
                 
-    except Exception as e:
-        result['issues'].append(f"Errore validazione profilo: {e}")
+        except Exception as e:
+            result['issues'].append(f"Errore lettura profilo ICC: {e}")
+    else:
+        # Nessun profilo ICC - assumiamo sRGB per PNG web
+        result['is_srgb'] = True
+        result['valid'] = True
+        result['profile_name'] = "Nessun profilo (assumendo sRGB)"
         
     return result
 
-def validate_dpi_or_size(image_path: str, min_dpi: int = 300, min_dimension: int = 4000) -> Dict[str, any]:
-    """
-    Valida DPI o dimensioni minime
-    
-    Returns:
-        Dict con risultato validazione
-    """
+def _validate_dpi_or_size(meta: Dict[str, any], min_dpi: int = 300, min_dimension: int = 4000) -> Dict[str, any]:
+    """Validazione DPI/dimensioni sui metadati già letti"""
     result = {
         'valid': False,
         'dpi': None,
@@ -170,39 +290,68 @@ def validate_dpi_or_size(image_path: str, min_dpi: int = 300, min_dimension: int
         'issues': []
     }
     
-    try:
-        with Image.open(image_path) as img:
-            width, height = img.size
-            result['dimensions'] = (width, height)
-            result['max_dimension'] = max(width, height)
-            
-            # Controlla DPI se disponibile
-            dpi_info = img.info.get('dpi')
-            if dpi_info:
-                dpi_x, dpi_y = dpi_info
-                avg_dpi = (dpi_x + dpi_y) / 2
-                result['dpi'] = int(avg_dpi)
-                result['meets_dpi'] = avg_dpi >= min_dpi
-                
-                if result['meets_dpi']:
-                    result['valid'] = True
-                else:
-                    result['issues'].append(f"DPI {avg_dpi} < {min_dpi} richiesti")
-            else:
-                # Nessuna info DPI, controlla dimensioni
-                result['meets_size'] = result['max_dimension'] >= min_dimension
-                
-                if result['meets_size']:
-                    result['valid'] = True
-                    result['issues'].append(f"Nessun DPI, ma dimensioni OK ({result['max_dimension']}px)")
-                else:
-                    result['issues'].append(f"Nessun DPI e dimensioni {result['max_dimension']}px < {min_dimension}px")
-                    
-    except Exception as e:
-        result['issues'].append(f"Errore validazione DPI/dimensioni: {e}")
+    if 'error' in meta:
+        result['issues'].append(f"Errore validazione DPI/dimensioni: {meta['error']}")
+        return result
+    
+    width, height = meta['size']
+    result['dimensions'] = (width, height)
+    result['max_dimension'] = max(width, height)
+    
+    # Controlla DPI se disponibile
+    dpi_info = meta['info'].get('dpi')
+    if dpi_info:
+        dpi_x, dpi_y = dpi_info
+        avg_dpi = (dpi_x + dpi_y) / 2
+        result['dpi'] = int(avg_dpi)
+        result['meets_dpi'] = avg_dpi >= min_dpi
+        
+        if result['meets_dpi']:
+            result['valid'] = True
+        else:
+            result['issues'].append(f"DPI {avg_dpi} < {min_dpi} richiesti")
+    else:
+        # Nessuna info DPI, controlla dimensioni
+        result['meets_size'] = result['max_dimension'] >= min_dimension
         
+        if result['meets_size']:
+            result['valid'] = True
+            result['issues'].append(f"Nessun DPI, ma dimensioni OK ({result['max_dimension']}px)")
+        else:
+            result['issues'].append(f"Nessun DPI e dimensioni {result['max_dimension']}px < {min_dimension}px")
+    
+    return result
+
+def validate_png_transparency(image_path: str) -> Dict[str, any]:
+    """
+    Valida che l'immagine sia PNG con trasparenza
+    
+    Returns:
+        Dict con risultato validazione
+    """
+    result = _validate_png_transparency(read_image_metadata(image_path))
+    if result.get('needs_conversion'):
+        print(f"    🔄 PNG RGB rilevato - conversione a RGBA disponibile")
     return result
 
+def validate_srgb_profile(image_path: str) -> Dict[str, any]:
+    """
+    Valida profilo colore sRGB
+    
+    Returns:
+        Dict con risultato validazione
+    """
+    return _validate_srgb_profile(read_image_metadata(image_path))
+
+def validate_dpi_or_size(image_path: str, min_dpi: int = 300, min_dimension: int = 4000) -> Dict[str, any]:
+    """
+    Valida DPI o dimensioni minime
+    
+    Returns:
+        Dict con risultato validazione
+    """
+    return _validate_dpi_or_size(read_image_metadata(image_path), min_dpi, min_dimension)
+
 def clean_border_artifacts(image_path: str, border_threshold: int = 2, output_path: Optional[str] = None) -> str:
     """
     Pulisce aloni/artefatti dai bordi (1-2 pixel)
@@ -224,22 +373,24 @@ def clean_border_artifacts(image_path: str, border_threshold: int = 2, output_pa
                 # Converti a RGBA per gestire trasparenza
                 img = img.convert('RGBA')
             
-            # Converti in array numpy per manipolazione pixel
-            img_array = np.array(img)
-            height, width = img_array.shape[:2]
+            # Lavora solo sul piano alpha: i canali RGB non vengono toccati
+            alpha = img.getchannel('A')
+            width, height = alpha.size
+            bt = border_threshold
             
-            # Pulisci bordi settando alpha a 0 (trasparente)
+            # Pulisci bordi settando alpha a 0 (trasparente), direttamente nel buffer PIL
+            draw = ImageDraw.Draw(alpha)
             # Top e bottom
-            img_array[:border_threshold, :, 3] = 0  # Top
-            img_array[-border_threshold:, :, 3] = 0  # Bottom
+            draw.rectangle([0, 0, width - 1, bt - 1], fill=0)  # Top
+            draw.rectangle([0, height - bt, width - 1, height - 1], fill=0)  # Bottom
             
             # Left e right  
-            img_array[:, :border_threshold, 3] = 0  # Left
-            img_array[:, -border_threshold:, 3] = 0  # Right
+            draw.rectangle([0, 0, bt - 1, height - 1], fill=0)  # Left
+            draw.rectangle([width - bt, 0, width - 1, height - 1], fill=0)  # Right
             
-            # Converti back a PIL Image
-            cleaned_img = Image.fromarray(img_array, 'RGBA')
-            cleaned_img.save(output_path, 'PNG', optimize=True)
+            # Reinserisci l'alpha nell'immagine
+            img.putalpha(alpha)
+            img.save(output_path, 'PNG', optimize=True)
             
             print(f"🧹 Puliti {border_threshold}px dai bordi: {os.path.basename(output_path)}")
             return output_path
@@ -248,79 +399,183 @@ def clean_border_artifacts(image_path: str, border_threshold: int = 2, output_pa
         print(f"❌ Errore pulizia bordi {image_path}: {e}")
         return image_path
 
+def clean_border_artifacts_batch(image_paths: List[str], border_threshold: int = 2,
+                                 max_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Pulisce i bordi di più immagini in parallelo.
+    Il costo è dominato da decodifica/encoding PNG, che in PIL rilasciano il GIL:
+    i thread lavorano davvero in parallelo.
+    
+    Args:
+        image_paths: Lista path immagini (sovrascritte)
+        border_threshold: Pixel da pulire dai bordi
+        max_workers: Numero thread (default: CPU disponibili)
+        
+    Returns:
+        Dict con mapping path input -> path file pulito
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if not image_paths:
+        return {}
+    
+    workers = max_workers or min(len(image_paths), os.cpu_count() or 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        cleaned = executor.map(lambda path: clean_border_artifacts(path, border_threshold), image_paths)
+        return dict(zip(image_paths, cleaned))
+
+@lru_cache(maxsize=1024)
+def _validate_onlyone_cached(image_path: str, mtime_ns: int, file_size: int) -> Dict[str, any]:
+    """Validazione memoizzata: qualsiasi modifica al file cambia (mtime_ns, size) e la invalida"""
+    return _validate_onlyone_image(image_path)
+
+def _validate_onlyone_copy(image_path: str) -> Dict[str, any]:
+    """Risultato (memoizzato) di _validate_onlyone_image, senza stampe"""
+    try:
+        st = os.stat(image_path)
+    except OSError:
+        return _validate_onlyone_image(image_path)
+    
+    result = _validate_onlyone_cached(image_path, st.st_mtime_ns, st.st_size)
+    
+    # Copia: il chiamante può modificare il risultato senza alterare la cache.
+    # Il dict è piatto, basta duplicare le due liste
+    return dict(result, issues=list(result['issues']), warnings=list(result['warnings']))
+
 def validate_onlyone_image(image_path: str) -> Dict[str, any]:
     """
-    Validazione completa OnlyOne per immagine input
+    Validazione completa OnlyOne per immagine input.
+    Il risultato è riusato tra le fasi della pipeline finché il file non cambia.
     
     Returns:
-        Dict con risultato validazione completa
+        Dict piatto con valid, issues, warnings e i valori scalari rilevati
+        (format, mode, width, height, dpi, is_srgb, file_size_mb, ...)
     """
-    from config_printful import IMAGE_REQUIREMENTS
+    result = _validate_onlyone_copy(image_path)
+    print(_onlyone_report(result))
+    return result
+
+validate_onlyone_image.cache_clear = _validate_onlyone_cached.cache_clear
+
+def validate_onlyone_batch(image_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, any]]:
+    """
+    Validazione OnlyOne di più immagini in parallelo.
+    Il lavoro è I/O (header, profilo ICC): i thread si sovrappongono sulle letture.
+    I report sono stampati dal thread principale, un file alla volta nell'ordine di input.
     
-    print(f"\n🔍 Validando {os.path.basename(image_path)}...")
+    Args:
+        image_paths: Lista path immagini (un path ripetuto è validato e riportato ogni volta)
+        max_workers: Numero thread (default: 2 per CPU, massimo 32)
+        
+    Returns:
+        Lista dei risultati validate_onlyone_image, uno per path nell'ordine di input
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    if not image_paths:
+        return []
     
+    results = []
+    workers = max_workers or min(32, (os.cpu_count() or 4) * 2, len(image_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(_validate_onlyone_copy, image_paths):
+            print(_onlyone_report(result))
+            results.append(result)
+    return results
+
+def _onlyone_report(result: Dict[str, any]) -> str:
+    """Report testuale di una validazione OnlyOne, da stampare con un solo print"""
+    lines = [f"\n🔍 Validando {os.path.basename(result['image_path'])}..."]
+    if result['needs_conversion']:
+        lines.append(f"    🔄 PNG RGB rilevato - conversione a RGBA disponibile")
+    
+    if result['valid']:
+        lines.append(f"  ✅ Validazione OK")
+        if result['warnings']:
+            lines.append(f"  ⚠️ {len(result['warnings'])} warning")
+    else:
+        lines.append(f"  ❌ {len(result['issues'])} errori critici")
+        # Debug: mostra errori dettagliati
+        for issue in result['issues']:
+            lines.append(f"    • {issue}")
+        for warning in result['warnings']:
+            lines.append(f"    ⚠️ {warning}")
+    
+    return "\n".join(lines)
+
+def _validate_onlyone_image(image_path: str) -> Dict[str, any]:
+    """Esegue tutte le validazioni OnlyOne sul file (il report è stampato dal chiamante)"""
+    from config_printful import IMAGE_REQUIREMENTS
+    
+    # Risultato piatto: solo scalari più le liste issues/warnings, niente dict annidati
     result = {
         'valid': True,
         'image_path': image_path,
+        'format': None,
+        'mode': None,
+        'width': 0,
+        'height': 0,
+        'max_dimension': 0,
+        'has_transparency': False,
+        'needs_conversion': False,
+        'is_srgb': False,
+        'profile_name': None,
+        'dpi': None,
+        'file_size_mb': None,
         'issues': [],
-        'warnings': [],
-        'validations': {}
+        'warnings': []
     }
+    issues = result['issues']
+    warnings = result['warnings']
+    
+    # Header letto una sola volta e condiviso dalle validazioni
+    meta = read_image_metadata(image_path)
     
     # 1. Validazione PNG trasparenza (con auto-fix)
-    png_result = validate_png_transparency(image_path)
-    result['validations']['png_transparency'] = png_result
+    png_result = _validate_png_transparency(meta)
+    result['format'] = png_result['format']
+    result['mode'] = png_result['mode']
+    result['has_transparency'] = png_result['has_transparency']
+    result['needs_conversion'] = png_result.get('needs_conversion', False)
     
     if not png_result['valid']:
         # Se è RGB e può essere convertito, è solo un warning
-        if png_result.get('needs_conversion', False):
-            result['warnings'].append("PNG RGB sarà convertito a RGBA automaticamente")
+        if result['needs_conversion']:
+            warnings.append("PNG RGB sarà convertito a RGBA automaticamente")
         else:
             result['valid'] = False
-            result['issues'].extend(png_result['issues'])
+            issues.extend(png_result['issues'])
     
     # 2. Validazione profilo sRGB
-    srgb_result = validate_srgb_profile(image_path)
-    result['validations']['srgb_profile'] = srgb_result
+    srgb_result = _validate_srgb_profile(meta)
+    result['is_srgb'] = srgb_result['is_srgb']
+    result['profile_name'] = srgb_result['profile_name']
     if not srgb_result['valid']:
-        result['warnings'].extend(srgb_result['issues'])  # Warning, non blocca
+        warnings.extend(srgb_result['issues'])  # Warning, non blocca
     
     # 3. Validazione DPI/dimensioni
-    dpi_result = validate_dpi_or_size(
-        image_path, 
+    dpi_result = _validate_dpi_or_size(
+        meta, 
         IMAGE_REQUIREMENTS['min_dpi'], 
         IMAGE_REQUIREMENTS['min_dimension']
     )
-    result['validations']['dpi_size'] = dpi_result
+    result['width'], result['height'] = dpi_result['dimensions']
+    result['max_dimension'] = dpi_result['max_dimension']
+    result['dpi'] = dpi_result['dpi']
     if not dpi_result['valid']:
         result['valid'] = False
-        result['issues'].extend(dpi_result['issues'])
+        issues.extend(dpi_result['issues'])
     
     # 4. Controlla dimensioni file
     try:
         file_size = os.path.getsize(image_path)
         max_size = IMAGE_REQUIREMENTS['max_file_size']
+        result['file_size_mb'] = file_size/1024/1024
         if file_size > max_size:
             result['valid'] = False
-            result['issues'].append(f"File {file_size/1024/1024:.1f}MB > {max_size/1024/1024:.1f}MB")
-        else:
-            result['validations']['file_size'] = {'valid': True, 'size_mb': file_size/1024/1024}
+            issues.append(f"File {file_size/1024/1024:.1f}MB > {max_size/1024/1024:.1f}MB")
     except Exception as e:
-        result['warnings'].append(f"Errore controllo dimensioni file: {e}")
-    
-    # Summary
-    if result['valid']:
-        print(f"  ✅ Validazione OK")
-        if result['warnings']:
-            print(f"  ⚠️ {len(result['warnings'])} warning")
-    else:
-        print(f"  ❌ {len(result['issues'])} errori critici")
-        # Debug: mostra errori dettagliati
-        for issue in result['issues']:
-            print(f"    • {issue}")
-        if result['warnings']:
-            for warning in result['warnings']:
-                print(f"    ⚠️ {warning}")
+        warnings.append(f"Errore controllo dimensioni file: {e}")
     
     return result
 
@@ -369,8 +624,15 @@ def prepare_image_for_printful(image_path: str, max_size: Tuple[int, int] = (450
                 print(f"  🔄 Convertito da {img.mode} a RGBA")
             
             # Ridimensiona se troppo grande (mantenendo aspect ratio)
-            if processed_img.width > max_size[0] or processed_img.height > max_size[1]:
+            resized = processed_img.width > max_size[0] or processed_img.height > max_size[1]
+            if resized:
                 old_size = (processed_img.width, processed_img.height)
+                
+                # Downscale forti: media box intera (reduce) fino a ~1-2x target,
+                # poi LANCZOS solo sul residuo (thumbnail non lo fa per RGBA)
+                factor = max(1, min(processed_img.width // max_size[0], processed_img.height // max_size[1]))
+                if factor > 1:
+                    processed_img = processed_img.reduce(factor)
                 processed_img.thumbnail(max_size, Image.Resampling.LANCZOS)
                 print(f"  🔧 Ridimensionato da {old_size} a {processed_img.size}")
             
@@ -378,11 +640,25 @@ def prepare_image_for_printful(image_path: str, max_size: Tuple[int, int] = (450
             if processed_img.mode == 'RGBA':
                 # PNG per trasparenza
                 output_path = image_path.replace('.jpg', '.png').replace('.jpeg', '.png')
-                processed_img.save(output_path, 'PNG', optimize=True)
-                print(f"  💾 Salvato come PNG trasparente: {os.path.basename(output_path)}")
             else:
                 # JPG per RGB (più piccolo)
                 output_path = image_path.replace('.png', '.jpg')
+            
+            # Nessuna conversione, resize o cambio formato: il file è già pronto,
+            # niente decodifica pixel né re-encoding
+            if processed_img is img and not resized and output_path == image_path:
+                print(f"  ✅ Già conforme, nessuna riscrittura: {os.path.basename(image_path)}")
+                return image_path
+            
+            if processed_img.mode == 'RGBA':
+                if resized:
+                    # File intermedio appena ricampionato: deflate veloce
+                    from config_printful import PNG_SAVE_OPTS
+                    processed_img.save(output_path, 'PNG', **PNG_SAVE_OPTS)
+                else:
+                    processed_img.save(output_path, 'PNG', optimize=True)
+                print(f"  💾 Salvato come PNG trasparente: {os.path.basename(output_path)}")
+            else:
                 processed_img.save(output_path, 'JPEG', optimize=True, quality=95)
                 print(f"  💾 Salvato come JPEG: {os.path.basename(output_path)}")
             
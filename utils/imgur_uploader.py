@@ -1,27 +1,134 @@
 # utils/imgur_uploader.py - Riscrittura completa per OnlyOne workflow
 import os
-import base64
+import json
+import mimetypes
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # Encoder SIMD opzionale, stessa API di base64 (molto più veloce su PNG grandi)
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+DEFAULT_CLIENT_ID = "546c25a59c58ad7"
+
+def create_session(client_id: str = DEFAULT_CLIENT_ID) -> requests.Session:
+    """
+    Crea una sessione HTTP con connessioni persistenti verso Imgur.
+    Headers di autenticazione impostati una volta; retry con backoff sugli errori
+    transitori (POST ritentate solo per errori di connessione, mai dopo l'invio).
+    
+    Args:
+        client_id: Client-ID Imgur
+        
+    Returns:
+        requests.Session configurata
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503])
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+    session.headers.update({
+        'Authorization': f'Client-ID {client_id}',
+        'User-Agent': 'OnlyOne-Uploader/1.0'
+    })
+    return session
+
+_shared_session: Optional[requests.Session] = None
+
+def _get_shared_session() -> requests.Session:
+    """Sessione condivisa per il client di default (test connessione + uploader)"""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session()
+    return _shared_session
+
+# Blocchi multipli di 3 byte: ogni blocco si codifica senza padding intermedio
+ENCODE_CHUNK_SIZE = 57000
+
+class _Base64JsonBody:
+    """
+    Body JSON {"...campi...", "image": "<base64>"} generato a blocchi durante l'invio:
+    memoria costante invece di file + stringa base64 + JSON serializzato.
+    La lunghezza è nota in anticipo (Content-Length, niente chunked encoding) e ogni
+    iterazione riparte dall'inizio del file, quindi il body è riutilizzabile nei retry.
+    """
+    
+    __slots__ = ('image_path', 'file_size', 'prologue', 'epilogue')
+    
+    def __init__(self, image_path: str, fields: Dict[str, str]):
+        self.image_path = image_path
+        self.file_size = os.path.getsize(image_path)
+        # Campi serializzati da json (escaping corretto), poi apertura della stringa image
+        self.prologue = json.dumps(fields)[:-1].encode('utf-8') + (b', "image": "' if fields else b'"image": "')
+        self.epilogue = b'"}'
+    
+    def __len__(self) -> int:
+        return len(self.prologue) + 4 * ((self.file_size + 2) // 3) + len(self.epilogue)
+    
+    def __iter__(self):
+        yield self.prologue
+        remaining = self.file_size
+        with open(self.image_path, "rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(ENCODE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield base64.b64encode(chunk)
+        yield self.epilogue
 
 class ImgurUploader:
     """
     Uploader Imgur robusto che preserva la trasparenza PNG
     """
     
-    def __init__(self, client_id: str = "546c25a59c58ad7"):
+    # Attributi fissi: niente __dict__ per istanza, accesso diretto agli slot
+    __slots__ = (
+        'client_id', 'upload_mode', 'upload_url', 'uploaded_images', 'session',
+        '_upload_versions', '_rate_lock', '_rate_remaining', '_rate_reset', '_next_slot'
+    )
+    
+    def __init__(self, client_id: str = DEFAULT_CLIENT_ID, session: Optional[requests.Session] = None,
+                 upload_mode: str = 'file'):
+        """
+        Args:
+            client_id: Client-ID Imgur
+            session: Sessione HTTP da usare (default: sessione condivisa/dedicata)
+            upload_mode: 'file' (multipart con byte grezzi) oppure 'base64' (payload JSON)
+        """
+        if upload_mode not in ('file', 'base64'):
+            raise ValueError(f"upload_mode non valido: {upload_mode}")
         self.client_id = client_id
+        self.upload_mode = upload_mode
         self.upload_url = "https://api.imgur.com/3/upload"
         self.uploaded_images = {}
+        # Versione del file caricata per ogni path: (mtime_ns, size)
+        self._upload_versions = {}
+        # Budget rate limit dagli headers Imgur, condiviso tra i thread di upload
+        self._rate_lock = threading.Lock()
+        self._rate_remaining = None
+        self._rate_reset = 0.0
+        self._next_slot = 0.0
+        # Una sola sessione: TCP/TLS riutilizzati tra upload e verifiche
+        if session is None:
+            session = _get_shared_session() if client_id == DEFAULT_CLIENT_ID else create_session(client_id)
+        self.session = session
         
-    def upload_image(self, image_path: str, title: Optional[str] = None) -> str:
+    def upload_image(self, image_path: str, title: Optional[str] = None, force: bool = False) -> str:
         """
         Carica una singola immagine su Imgur.
+        Se la stessa versione del file è già stata caricata ritorna l'URL in cache.
         
         Args:
             image_path: Path dell'immagine da caricare
             title: Titolo opzionale per l'immagine
+            force: Se True ricarica anche se già in cache
             
         Returns:
             URL pubblico dell'immagine caricata
@@ -30,78 +137,152 @@ class ImgurUploader:
             FileNotFoundError: Se il file non esiste
             Exception: Se l'upload fallisce
         """
-        if not os.path.exists(image_path):
+        try:
+            st = os.stat(image_path)
+        except OSError:
             raise FileNotFoundError(f"Immagine non trovata: {image_path}")
         
         filename = os.path.basename(image_path)
+        version = (st.st_mtime_ns, st.st_size)
+        
+        # File invariato dall'ultimo upload: niente rete né codifica
+        cached = self.uploaded_images.get(image_path)
+        if cached and not force and self._upload_versions.get(image_path) == version:
+            print(f"↺ {filename} (cached)")
+            return cached
+        
         if title is None:
             title = os.path.splitext(filename)[0]
-            
-        print(f"📤 {filename}...", end="", flush=True)
         
+        # Esito stampato su una sola riga a upload concluso: con upload paralleli
+        # le righe di file diversi non si mescolano
         try:
-            # Leggi e codifica immagine
-            with open(image_path, "rb") as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
-            
-            # Prepara headers
-            headers = {
-                'Authorization': f'Client-ID {self.client_id}',
-                'Content-Type': 'application/json',
-                'User-Agent': 'OnlyOne-Uploader/1.0'
-            }
-            
-            # Payload
-            payload = {
-                'image': image_data,
-                'type': 'base64',
-                'title': title,
-                'description': 'OnlyOne Printful upload'
-            }
-            
-            # Upload
-            response = requests.post(
-                self.upload_url,
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            
+            # Upload (Authorization e User-Agent dalla sessione)
+            response = self._post_with_backoff(image_path, filename, title)
             response.raise_for_status()
             result = response.json()
             
             # Verifica risposta
             if not result.get('success', False):
                 error_msg = result.get('data', {}).get('error', 'Upload fallito')
-                print(f" ❌ {error_msg}")
                 raise Exception(f"Imgur error: {error_msg}")
             
             url = result['data']['link']
             if not url:
-                print(" ❌ URL vuoto")
                 raise Exception("URL vuoto ricevuto da Imgur")
             
             # Salva in cache
             self.uploaded_images[image_path] = url
-            print(" ✅")
+            self._upload_versions[image_path] = version
+            print(f"📤 {filename} ✅")
             return url
             
         except requests.exceptions.Timeout:
-            print(" ❌ Timeout")
+            print(f"📤 {filename} ❌ Timeout")
             raise Exception("Timeout durante upload")
         except requests.exceptions.RequestException as e:
-            print(f" ❌ Errore rete")
+            print(f"📤 {filename} ❌ Errore rete")
             raise Exception(f"Errore rete: {e}")
         except Exception as e:
-            print(f" ❌ {str(e)}")
+            print(f"📤 {filename} ❌ {str(e)}")
             raise
     
-    def upload_multiple_images(self, image_paths: List[str]) -> Dict[str, str]:
+    # Sotto questa soglia di upload residui gli avvii vengono distribuiti fino al reset
+    RATE_LIMIT_LOW = 5
+    # Tentativi aggiuntivi dopo una risposta 429
+    MAX_RATE_LIMIT_RETRIES = 3
+    
+    def _wait_rate_limit(self):
+        """
+        Attende il proprio turno secondo il budget Imgur: nessuna attesa finché restano
+        upload sufficienti, altrimenti avvii distanziati di (reset - ora) / residui.
+        """
+        with self._rate_lock:
+            now = time.time()
+            start_at = max(now, self._next_slot)
+            if self._rate_remaining is not None and self._rate_remaining < self.RATE_LIMIT_LOW:
+                interval = max(0.0, self._rate_reset - now) / max(self._rate_remaining, 1)
+                self._next_slot = start_at + interval
+        if start_at > now:
+            time.sleep(start_at - now)
+    
+    def _update_rate_limit(self, response: requests.Response):
+        """Aggiorna il budget residuo dagli headers X-RateLimit-* della risposta"""
+        headers = response.headers
+        remaining = [int(value) for value in (headers.get('X-RateLimit-UserRemaining'),
+                                              headers.get('X-RateLimit-ClientRemaining'))
+                     if value and value.isdigit()]
+        reset = headers.get('X-RateLimit-UserReset')
+        with self._rate_lock:
+            if remaining:
+                self._rate_remaining = min(remaining)
+            if reset and reset.isdigit():
+                self._rate_reset = float(reset)
+    
+    def _post_with_backoff(self, image_path: str, filename: str, title: str) -> requests.Response:
+        """
+        Esegue l'upload rispettando il rate limit; su 429 ritenta con backoff
+        esponenziale a partire da Retry-After (la richiesta rifiutata non è stata eseguita).
+        """
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            self._wait_rate_limit()
+            if self.upload_mode == 'file':
+                response = self._post_file(image_path, filename, title)
+            else:
+                response = self._post_base64(image_path, title)
+            self._update_rate_limit(response)
+            
+            if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                return response
+            
+            try:
+                wait = float(response.headers.get('Retry-After', 2)) * 2 ** attempt
+            except ValueError:
+                wait = 2.0 * 2 ** attempt
+            # Blocca anche gli avvii degli altri thread fino alla fine del backoff
+            with self._rate_lock:
+                self._next_slot = max(self._next_slot, time.time() + wait)
+            print(f"📤 {filename} ⏳ rate limit, ritento tra {wait:.1f}s")
+        return response
+    
+    def _post_file(self, image_path: str, filename: str, title: str) -> requests.Response:
+        """Upload multipart/form-data con i byte grezzi: niente base64 né JSON"""
+        mime_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        with open(image_path, "rb") as fh:
+            return self.session.post(
+                self.upload_url,
+                files={'image': (filename, fh, mime_type)},
+                data={
+                    'type': 'file',
+                    'title': title,
+                    'description': 'OnlyOne Printful upload'
+                },
+                timeout=60
+            )
+    
+    def _post_base64(self, image_path: str, title: str) -> requests.Response:
+        """Upload JSON con immagine codificata in base64, body generato in streaming"""
+        body = _Base64JsonBody(image_path, {
+            'type': 'base64',
+            'title': title,
+            'description': 'OnlyOne Printful upload'
+        })
+        return self.session.post(
+            self.upload_url,
+            data=body,
+            headers={'Content-Type': 'application/json'},
+            timeout=60
+        )
+    
+    def upload_multiple_images(self, image_paths: List[str], max_concurrency: int = 4) -> Dict[str, str]:
         """
         Upload multiplo con gestione errori e rate limiting.
+        Fino a max_concurrency upload in parallelo; le attese dipendono dal budget
+        residuo riportato da Imgur (vedi _wait_rate_limit).
         
         Args:
             image_paths: Lista di path immagini
+            max_concurrency: Numero massimo di upload contemporanei
             
         Returns:
             Dict {image_path: url} per upload riusciti
@@ -114,37 +295,35 @@ class ImgurUploader:
         successful_uploads = {}
         failed_uploads = []
         
-        for i, image_path in enumerate(image_paths, 1):
-            try:
-                # Title univoco per evitare duplicati
-                timestamp = int(time.time())
-                title = f"onlyone_{timestamp}_{i}"
-                
-                url = self.upload_image(image_path, title)
-                successful_uploads[image_path] = url
-                
-                # Rate limiting: pausa tra upload
-                if i < len(image_paths):
-                    time.sleep(1.5)
-                    
-            except Exception as e:
-                failed_uploads.append((image_path, str(e)))
-                print(f"❌ {os.path.basename(image_path)}: {e}")
-                
-                # Pausa anche sui fallimenti per evitare rate limit
-                time.sleep(0.5)
+        workers = max(1, min(max_concurrency, len(image_paths)))
         
-        # Summary
-        print(f"\n📊 Risultati batch:")
-        print(f"  ✅ Successi: {len(successful_uploads)}")
-        print(f"  ❌ Fallimenti: {len(failed_uploads)}")
+        # Title univoco per evitare duplicati: timestamp del batch + indice
+        timestamp = int(time.time())
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.upload_image, image_path, f"onlyone_{timestamp}_{i}")
+                       for i, image_path in enumerate(image_paths, 1)]
+            
+            for image_path, future in zip(image_paths, futures):
+                try:
+                    successful_uploads[image_path] = future.result()
+                except Exception as e:
+                    filename = os.path.basename(image_path)
+                    failed_uploads.append((filename, str(e)))
+                    print(f"❌ {filename}: {e}")
         
+        # Summary (una sola scrittura)
+        summary = [
+            "\n📊 Risultati batch:",
+            f"  ✅ Successi: {len(successful_uploads)}",
+            f"  ❌ Fallimenti: {len(failed_uploads)}"
+        ]
         if failed_uploads and len(failed_uploads) <= 3:
-            print("  File falliti:")
-            for path, error in failed_uploads:
-                print(f"    • {os.path.basename(path)}: {error}")
+            summary.append("  File falliti:")
+            summary.extend(f"    • {filename}: {error}" for filename, error in failed_uploads)
         elif failed_uploads:
-            print(f"  File falliti: {len(failed_uploads)} (primi 3 mostrati sopra)")
+            summary.append(f"  File falliti: {len(failed_uploads)} (primi 3 mostrati sopra)")
+        print("\n".join(summary))
         
         return successful_uploads
     
@@ -181,13 +360,14 @@ class ImgurUploader:
             True se accessibile
         """
         try:
-            # User-Agent simile a quello che userebbe Printful
+            # User-Agent simile a quello che userebbe Printful, senza credenziali API
             headers = {
                 'User-Agent': 'Mozilla/5.0 (compatible; Printful/1.0)',
-                'Accept': 'image/*,*/*;q=0.8'
+                'Accept': 'image/*,*/*;q=0.8',
+                'Authorization': None
             }
             
-            response = requests.head(url, headers=headers, timeout=10, allow_redirects=True)
+            response = self.session.head(url, headers=headers, timeout=10, allow_redirects=True)
             
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '')
@@ -198,9 +378,13 @@ class ImgurUploader:
         except Exception:
             return False
     
-    def batch_verify_urls(self) -> Dict[str, bool]:
+    def batch_verify_urls(self, max_concurrency: int = 10) -> Dict[str, bool]:
         """
         Verifica accessibilità di tutti gli URL caricati.
+        Le HEAD sono indipendenti: partono in parallelo (max_concurrency alla volta).
+        
+        Args:
+            max_concurrency: Numero massimo di verifiche contemporanee
         
         Returns:
             Dict {image_path: accessible} per tutte le immagini
@@ -210,18 +394,13 @@ class ImgurUploader:
         
         print(f"🔍 Verifica accessibilità {len(self.uploaded_images)} URL...")
         
-        results = {}
-        accessible_count = 0
+        items = list(self.uploaded_images.items())
+        workers = max(1, min(max_concurrency, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            accessible = executor.map(self.verify_url_accessibility, [url for _, url in items])
+            results = {image_path: ok for (image_path, _), ok in zip(items, accessible)}
         
-        for image_path, url in self.uploaded_images.items():
-            accessible = self.verify_url_accessibility(url)
-            results[image_path] = accessible
-            
-            if accessible:
-                accessible_count += 1
-            
-            # Piccola pausa per essere gentili con Imgur
-            time.sleep(0.2)
+        accessible_count = sum(results.values())
         
         print(f"  ✅ Accessibili: {accessible_count}/{len(self.uploaded_images)}")
         
@@ -239,6 +418,7 @@ class ImgurUploader:
     def clear_cache(self):
         """Pulisce la cache delle URL caricate"""
         self.uploaded_images.clear()
+        self._upload_versions.clear()
         print("🧹 Cache URL pulita")
     
     def get_cache_info(self) -> Dict:
@@ -255,25 +435,38 @@ class ImgurUploader:
             'upload_url': self.upload_url
         }
 
-def test_imgur_connection() -> bool:
+# Esito dell'ultimo test di connettività (la raggiungibilità cambia raramente in pochi secondi)
+CONNECTION_TEST_TTL = 30.0
+_CONN_CACHE = {'ok': None, 'ts': 0.0}
+
+def test_imgur_connection(force: bool = False) -> bool:
     """
     Test veloce di connettività Imgur.
+    L'esito è riusato per CONNECTION_TEST_TTL secondi.
+    
+    Args:
+        force: Se True ignora l'esito in cache e ripete il test
     
     Returns:
         True se Imgur è raggiungibile
     """
+    if (not force and _CONN_CACHE['ok'] is not None
+            and time.monotonic() - _CONN_CACHE['ts'] < CONNECTION_TEST_TTL):
+        return _CONN_CACHE['ok']
+    
     try:
-        response = requests.get(
+        # Sessione condivisa: la connessione aperta qui viene riusata dagli upload
+        response = _get_shared_session().get(
             "https://api.imgur.com/3/credits",
-            headers={
-                'Authorization': 'Client-ID 546c25a59c58ad7',
-                'User-Agent': 'OnlyOne-Uploader/1.0'
-            },
             timeout=10
         )
-        return response.status_code == 200
+        ok = response.status_code == 200
     except Exception:
-        return False
+        ok = False
+    
+    _CONN_CACHE['ok'] = ok
+    _CONN_CACHE['ts'] = time.monotonic()
+    return ok
 
 def create_uploader() -> ImgurUploader:
     """
@@ -1,13 +1,31 @@
 # utils/text_utils.py - Versione estesa con slug generator OnlyOne
 import re
 import unicodedata
-from typing import List, Optional
+from functools import lru_cache
+from typing import AbstractSet, List, Optional, Tuple
+
+# Pattern compilati una volta all'import (usati per ogni filename nei batch)
+_RE_WS = re.compile(r'\s+')
+_RE_NONALNUM_SPACE = re.compile(r'[^a-z0-9\s]')
+_RE_SEPARATOR_RUN = re.compile(r'[\s-]+')
+_RE_VALID_SLUG = re.compile(r'^[a-z0-9-]+$')
+# Slug ben formato in un solo match: caratteri ammessi, niente '--', niente trattini ai bordi
+_RE_SLUG_FORMAT = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+_RE_APOS_SPACE = re.compile(r"\s+'")
+# Articolo iniziale seguito da uno spazio (come startswith('il '), ecc.)
+_RE_LEADING_ARTICLE = re.compile(r'^(?:il|la|lo|gli|le|un|una|uno) ')
+
+# Articoli/preposizioni lasciati in minuscolo nei titoli (tranne in prima posizione)
+_ITALIAN_STOPWORDS = frozenset({
+    'del', 'della', 'dell', 'dello', 'dei', 'degli', 'delle',
+    'di', 'da', 'in', 'con', 'su', 'per', 'tra', 'fra', 'a', 'e'
+})
 
 def slugify(text: str) -> str:
     """Converte il testo in slug per URL"""
     text = text.lower()
-    text = re.sub(r'[^a-z0-9\s]', '', text)
-    text = re.sub(r'\s+', '_', text)
+    text = _RE_NONALNUM_SPACE.sub('', text)
+    text = _RE_WS.sub('_', text)
     text = text.strip('_')
     return text
 
@@ -25,38 +43,63 @@ def normalize_product_name(filename: str) -> str:
     
     return filename
 
+# Config letta al primo uso e poi riusata: import a livello di modulo caricherebbe
+# config_printful (e .env) a ogni import di utils
+@lru_cache(maxsize=1)
+def _light_colors() -> frozenset:
+    from config_printful import LIGHT_COLORS
+    return frozenset(LIGHT_COLORS)
+
+@lru_cache(maxsize=1)
+def _product_templates() -> Tuple[str, str]:
+    """(PRODUCT_TITLE_TEMPLATE, PRODUCT_DESCRIPTION_TEMPLATE)"""
+    from config_printful import PRODUCT_TITLE_TEMPLATE, PRODUCT_DESCRIPTION_TEMPLATE
+    return PRODUCT_TITLE_TEMPLATE, PRODUCT_DESCRIPTION_TEMPLATE
+
+_PRODUCT_TYPE_NAMES = {
+    'tshirt': 'T-Shirt',
+    'hoodie': 'Hoodie', 
+    'sweatshirt': 'Sweatshirt',
+    'cap': 'Cap'
+}
+
 def is_light_color(color: str) -> bool:
     """Determina se un colore è chiaro"""
-    from config_printful import LIGHT_COLORS
-    return color in LIGHT_COLORS
+    return color in _light_colors()
 
 def create_product_description(product_name: str) -> str:
     """Crea la descrizione del prodotto per Printful"""
-    from config_printful import PRODUCT_DESCRIPTION_TEMPLATE
-    return PRODUCT_DESCRIPTION_TEMPLATE.format(title=product_name)
+    return _product_templates()[1].format(title=product_name)
 
 def create_product_title(base_name: str, product_type: str) -> str:
     """Crea il titolo del prodotto"""
-    type_names = {
-        'tshirt': 'T-Shirt',
-        'hoodie': 'Hoodie', 
-        'sweatshirt': 'Sweatshirt',
-        'cap': 'Cap'
-    }
-    
-    product_type_name = type_names.get(product_type, product_type.title())
-    from config_printful import PRODUCT_TITLE_TEMPLATE
-    return PRODUCT_TITLE_TEMPLATE.format(title=f"{base_name} — {product_type_name}")
+    product_type_name = _PRODUCT_TYPE_NAMES.get(product_type, product_type.title())
+    return _product_templates()[0].format(title=f"{base_name} — {product_type_name}")
 
 # ==================== ONLYONE SLUG GENERATOR ====================
 
+class _CombiningMarkTable(dict):
+    """
+    Tabella per str.translate: elimina i segni combinanti (categoria Mn), lascia
+    invariati gli altri codepoint. Ogni codepoint è classificato una sola volta,
+    poi le lookup restano nel dict (C).
+    """
+    def __missing__(self, codepoint: int):
+        value = None if unicodedata.category(chr(codepoint)) == 'Mn' else codepoint
+        self[codepoint] = value
+        return value
+
+_COMBINING_MARKS = _CombiningMarkTable()
+
 def remove_accents(text: str) -> str:
     """Rimuove accenti e caratteri speciali Unicode"""
+    # Testo ASCII: niente da decomporre
+    if text.isascii():
+        return text
     # Normalizza Unicode (NFD = decompone caratteri accentati)
     nfd = unicodedata.normalize('NFD', text)
-    # Filtra solo caratteri ASCII (rimuove accenti)
-    ascii_text = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
-    return ascii_text
+    # Elimina i segni combinanti (accenti) con una sola translate
+    return nfd.translate(_COMBINING_MARKS)
 
 def generate_kebab_slug(filename: str) -> str:
     """
@@ -83,26 +126,13 @@ def generate_kebab_slug(filename: str) -> str:
     name = name.lower()
     
     # Rimuovi articoli italiani comuni all'inizio
-    articles = ['il ', 'la ', 'lo ', 'gli ', 'le ', 'un ', 'una ', 'uno ']
-    for article in articles:
-        if name.startswith(article):
-            name = name[len(article):]
-            break
-    
-    # Sostituisci spazi multipli con spazio singolo
-    name = re.sub(r'\s+', ' ', name)
+    name = _RE_LEADING_ARTICLE.sub('', name, count=1)
     
     # Rimuovi caratteri non alfanumerici (tieni solo lettere, numeri, spazi)
-    name = re.sub(r'[^a-z0-9\s]', '', name)
-    
-    # Converti spazi in trattini
-    slug = re.sub(r'\s+', '-', name.strip())
+    name = _RE_NONALNUM_SPACE.sub('', name)
     
-    # Rimuovi trattini multipli
-    slug = re.sub(r'-+', '-', slug)
-    
-    # Rimuovi trattini all'inizio e fine
-    slug = slug.strip('-')
+    # Sequenze di spazi/trattini → un trattino (una sola passata), poi bordi
+    slug = _RE_SEPARATOR_RUN.sub('-', name).strip('-')
     
     return slug
 
@@ -134,10 +164,10 @@ def extract_title_from_slug(slug: str, max_words: int = 4) -> str:
     title_words = []
     for word in words:
         # Gestisci articoli/preposizioni italiane (lowercase)
-        if word.lower() in ['del', 'della', 'dell', 'dello', 'dei', 'degli', 'delle', 
-                           'di', 'da', 'in', 'con', 'su', 'per', 'tra', 'fra', 'a', 'e']:
+        lower = word.lower()
+        if lower in _ITALIAN_STOPWORDS:
             if len(title_words) > 0:  # Non all'inizio
-                title_words.append(word.lower())
+                title_words.append(lower)
             else:
                 title_words.append(word.capitalize())
         else:
@@ -159,6 +189,12 @@ def validate_slug(slug: str) -> dict:
         'warnings': []
     }
     
+    # Caso comune: lunghezza e formato corretti, nessun issue da raccogliere
+    if len(slug) >= 3 and _RE_SLUG_FORMAT.fullmatch(slug):
+        if len(slug) > 50:
+            result['warnings'].append("Slug lungo (> 50 caratteri)")
+        return result
+    
     # Controlla lunghezza
     if len(slug) < 3:
         result['valid'] = False
@@ -167,7 +203,7 @@ def validate_slug(slug: str) -> dict:
         result['warnings'].append("Slug lungo (> 50 caratteri)")
     
     # Controlla caratteri permessi
-    if not re.match(r'^[a-z0-9-]+$', slug):
+    if not _RE_VALID_SLUG.match(slug):
         result['valid'] = False
         result['issues'].append("Caratteri non permessi (solo a-z, 0-9, -)")
     
@@ -183,19 +219,21 @@ def validate_slug(slug: str) -> dict:
     
     return result
 
-def generate_unique_slug(filename: str, existing_slugs: List[str]) -> str:
+def generate_unique_slug(filename: str, existing_slugs: AbstractSet[str]) -> str:
     """
     Genera slug unico evitando duplicati
     
     Args:
         filename: Nome file originale
-        existing_slugs: Lista slug già esistenti
+        existing_slugs: Set slug già esistenti (lookup O(1))
         
     Returns:
         Slug unico con suffisso numerico se necessario
     """
-    base_slug = generate_kebab_slug(filename)
-    
+    return _unique_slug(generate_kebab_slug(filename), existing_slugs)
+
+def _unique_slug(base_slug: str, existing_slugs: AbstractSet[str]) -> str:
+    """Aggiunge a base_slug il primo suffisso numerico libero, se già usato"""
     if base_slug not in existing_slugs:
         return base_slug
     
@@ -228,22 +266,25 @@ def batch_generate_slugs(filenames: List[str]) -> dict:
         }
     }
     
-    existing_slugs = []
+    existing_slugs = set()
+    
+    # Slug base calcolati una sola volta per ogni nome file distinto
+    base_slugs = {filename: generate_kebab_slug(filename) for filename in dict.fromkeys(filenames)}
     
     for filename in filenames:
         # Genera slug unico
-        slug = generate_unique_slug(filename, existing_slugs)
+        base_slug = base_slugs[filename]
+        slug = _unique_slug(base_slug, existing_slugs)
         
         # Valida slug
         validation = validate_slug(slug)
         
         if validation['valid']:
             result['mappings'][filename] = slug
-            existing_slugs.append(slug)
+            existing_slugs.add(slug)
             result['stats']['valid'] += 1
             
             # Controlla se era duplicato
-            base_slug = generate_kebab_slug(filename)
             if slug != base_slug:
                 result['duplicates_found'].append({
                     'filename': filename,
@@ -275,9 +316,9 @@ def format_title_for_display(title: str) -> str:
     
     # Gestisci apostrofi speciali
     title = title.replace("'", "'")  # Apostrofo tipografico
-    title = re.sub(r"\s+'", "'", title)  # Rimuovi spazi prima apostrofo
+    title = _RE_APOS_SPACE.sub("'", title)  # Rimuovi spazi prima apostrofo
     
     # Pulisci spazi multipli
-    title = re.sub(r'\s+', ' ', title).strip()
+    title = _RE_WS.sub(' ', title).strip()
     
     return title
\ No newline at end of file